@@ -30,8 +30,9 @@ Wymagania:
 __version__ = "0.1.13"
 __author__ = "Softreck"
 
-# Główne API
-# Generator ID (bez OCR)
+from importlib import import_module as _import_module
+
+# Generator ID (bez OCR) - lekki, importowany od razu
 from .document_id import (
     AmountNormalizer,
     DateNormalizer,
@@ -44,83 +45,117 @@ from .document_id import (
     generate_receipt_id,
 )
 
-# Ekstraktory
-from .extractors import (
-    DocumentCategory,
-    DocumentExtractor,
-    ExtractionResult,
-)
+# Import powyżej przypina podmoduł pod nazwą ``document_id``, a publiczne API
+# eksportuje pod nią funkcję z ``dedup`` - zwalniamy nazwę dla __getattr__.
+globals().pop('document_id', None)
 
-# OCR
-from .ocr_processor import (
-    DocumentOCRResult,
-    OCREngine,
-    OCRProcessor,
-    OCRResult,
-    PaddleOCRProcessor,
-    TesseractOCRProcessor,
-    preprocess_image_for_ocr,
-)
+# Pozostałe moduły (OCR, obraz, PDF) ładujemy leniwie (PEP 562), żeby komendy
+# bez OCR (np. ``docid generate-id``, ``--version``) nie płaciły za ich import.
+_LAZY = {
+    # Ekstraktory
+    'DocumentCategory': ('.extractors', 'DocumentCategory'),
+    'DocumentExtractor': ('.extractors', 'DocumentExtractor'),
+    'ExtractionResult': ('.extractors', 'ExtractionResult'),
 
-# Universal Document ID Generator
-from .document_id_universal import (
-    UniversalDocumentIDGenerator,
-    UniversalDocumentFeatures,
-    DocumentType as UniversalDocumentType,
-    generate_universal_document_id,
-    verify_universal_document_id,
-    compare_universal_documents,
-)
-from .pipeline import (
-    DocumentPipeline,
-    ProcessedDocument,
-    get_document_id,
-    get_pipeline,
-    process_document,
-    verify_document_id,
-)
+    # OCR
+    'DocumentOCRResult': ('.ocr_processor', 'DocumentOCRResult'),
+    'OCREngine': ('.ocr_processor', 'OCREngine'),
+    'OCRProcessor': ('.ocr_processor', 'OCRProcessor'),
+    'OCRResult': ('.ocr_processor', 'OCRResult'),
+    'PaddleOCRProcessor': ('.ocr_processor', 'PaddleOCRProcessor'),
+    'TesseractOCRProcessor': ('.ocr_processor', 'TesseractOCRProcessor'),
+    'preprocess_image_for_ocr': ('.ocr_processor', 'preprocess_image_for_ocr'),
 
-# Wizualny odcisk dokumentu (identyfikacja graficzna przed OCR)
-from .visual_fingerprint import (
-    VisualFingerprint,
-    VisualMatch,
-    FieldSource,
-    compute_fingerprint,
-    find_best_match,
-    hamming_distance,
-    similarity,
-    merge_records,
-    DEFAULT_MAX_DISTANCE,
-)
+    # Universal Document ID Generator
+    'UniversalDocumentIDGenerator': ('.document_id_universal', 'UniversalDocumentIDGenerator'),
+    'UniversalDocumentFeatures': ('.document_id_universal', 'UniversalDocumentFeatures'),
+    'UniversalDocumentType': ('.document_id_universal', 'DocumentType'),
+    'generate_universal_document_id': ('.document_id_universal', 'generate_universal_document_id'),
+    'generate_universal_document_ids': ('.document_id_universal', 'generate_universal_document_ids'),
+    'verify_universal_document_id': ('.document_id_universal', 'verify_universal_document_id'),
+    'compare_universal_documents': ('.document_id_universal', 'compare_universal_documents'),
+
+    # Pipeline
+    'DocumentPipeline': ('.pipeline', 'DocumentPipeline'),
+    'ProcessedDocument': ('.pipeline', 'ProcessedDocument'),
+    'get_document_id': ('.pipeline', 'get_document_id'),
+    'get_pipeline': ('.pipeline', 'get_pipeline'),
+    'process_document': ('.pipeline', 'process_document'),
+    'verify_document_id': ('.pipeline', 'verify_document_id'),
+
+    # Wizualny odcisk dokumentu (identyfikacja graficzna przed OCR)
+    'VisualFingerprint': ('.visual_fingerprint', 'VisualFingerprint'),
+    'VisualMatch': ('.visual_fingerprint', 'VisualMatch'),
+    'FieldSource': ('.visual_fingerprint', 'FieldSource'),
+    'compute_fingerprint': ('.visual_fingerprint', 'compute_fingerprint'),
+    'find_best_match': ('.visual_fingerprint', 'find_best_match'),
+    'hamming_distance': ('.visual_fingerprint', 'hamming_distance'),
+    'similarity': ('.visual_fingerprint', 'similarity'),
+    'merge_records': ('.visual_fingerprint', 'merge_records'),
+    'DEFAULT_MAX_DISTANCE': ('.visual_fingerprint', 'DEFAULT_MAX_DISTANCE'),
+}
 
 # Deduplikacja dokumentów używana przez konektory URI i dashboardy
-from .dedup import (
-    BUSINESS_KEY_FIELDS,
-    BUSINESS_KEY_VISUAL_NEAR,
-    FINGERPRINT_DISTINCT_FIELDS,
-    FINGERPRINT_MIN_MATCH,
-    METADATA_UNKNOWN,
-    MONEY_OVERLAP_MIN_JACCARD,
-    MONEY_OVERLAP_MIN_SHARED,
-    VISUAL_NEAR_DISTANCE,
-    VISUAL_STRONG_DISTANCE,
-    business_key,
-    dhash_distance,
-    document_id,
-    document_matches,
-    document_signature,
-    evaluate,
-    find_duplicate,
-    fingerprint_match_count,
-    image_dhash,
-    image_phash,
-    metadata_completeness,
-    money_overlap,
-    money_tokens,
-    normalize_text,
-    reconcile,
-    transaction_fingerprint,
-)
+_LAZY.update({
+    name: ('.dedup', name)
+    for name in (
+        'BUSINESS_KEY_FIELDS',
+        'BUSINESS_KEY_VISUAL_NEAR',
+        'FINGERPRINT_DISTINCT_FIELDS',
+        'FINGERPRINT_MIN_MATCH',
+        'METADATA_UNKNOWN',
+        'MONEY_OVERLAP_MIN_JACCARD',
+        'MONEY_OVERLAP_MIN_SHARED',
+        'VISUAL_NEAR_DISTANCE',
+        'VISUAL_STRONG_DISTANCE',
+        'business_key',
+        'dhash_distance',
+        'document_id',
+        'document_matches',
+        'document_signature',
+        'evaluate',
+        'find_duplicate',
+        'fingerprint_match_count',
+        'image_dhash',
+        'image_phash',
+        'metadata_completeness',
+        'money_overlap',
+        'money_tokens',
+        'normalize_text',
+        'reconcile',
+        'transaction_fingerprint',
+    )
+})
+
+
+# Podmoduły dostępne jako atrybuty pakietu (``docid.pipeline``) - jak przy
+# imporcie zachłannym; ``document_id`` to funkcja z ``dedup``
+_SUBMODULES = frozenset({
+    'dedup',
+    'document_id_universal',
+    'extractors',
+    'ocr_processor',
+    'pipeline',
+    'visual_fingerprint',
+})
+
+
+def __getattr__(name):
+    """Leniwie importuje symbol albo podmoduł przy pierwszym dostępie."""
+    if name in _SUBMODULES:
+        return _import_module('.' + name, __name__)
+    try:
+        module_name, attr = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(_import_module(module_name, __name__), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY) | _SUBMODULES)
+
 
 __all__ = [
     # Wersja
@@ -166,6 +201,7 @@ __all__ = [
     'UniversalDocumentFeatures',
     'UniversalDocumentType',
     'generate_universal_document_id',
+    'generate_universal_document_ids',
     'verify_universal_document_id',
     'compare_universal_documents',
 
@@ -6,12 +6,15 @@ Użycie:
     # Przetwórz pojedynczy plik
     docid process faktura.pdf
 
-    # Przetwórz wiele plików
-    docid process *.pdf *.jpg
+    # Przetwórz wiele plików (równolegle na 4 rdzeniach)
+    docid process *.pdf *.jpg --workers 4
 
     # Batch z katalogu
     docid batch ./dokumenty/ --output results.json
 
+    # Batch równolegle na 4 rdzeniach
+    docid batch ./dokumenty/ --workers 4
+
     # Weryfikacja ID
     docid verify faktura.pdf DOC-FV-A7B3C9D2E1F04856
 
@@ -24,33 +27,159 @@ Użycie:
 """
 
 import argparse
+import contextlib
+import hashlib
+import itertools
 import json
 import logging
+import os
 import sys
+import traceback
 from pathlib import Path
 
-# Konfiguracja logowania
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# orjson (opcjonalny, pip install docid[fast]) serializuje wyniki kilkukrotnie
+# szybciej niż json z biblioteki standardowej
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# blake3 (opcjonalny, docid[fast]) - wielowątkowy, SIMD; używany tylko do
+# porównywania zawartości plików, nie do generowania ID dokumentów
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+# Rozszerzenia plików przetwarzanych przez `docid batch` (krotka dla str.endswith)
+BATCH_EXTENSIONS = ('.pdf', '.png', '.jpg', '.jpeg', '.tiff', '.bmp')
+
+
+def _json_bytes(data, indent: bool = False) -> bytes:
+    """Serializuje dane do JSON (UTF-8), przez orjson jeśli jest dostępny."""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(data, option=option | orjson.OPT_NON_STR_KEYS, default=str)
+    return json.dumps(
+        data, indent=2 if indent else None, ensure_ascii=False, default=str,
+    ).encode('utf-8')
+
+
+def _save_json(path: str, data):
+    """Zapisuje wyniki jako sformatowany JSON."""
+    with open(path, 'wb') as f:
+        f.write(_json_bytes(data, indent=True))
+
+
+def _open_jsonl(args):
+    """Otwiera plik wyjściowy JSON Lines (--jsonl), inaczej pusty kontekst."""
+    if args.output and args.jsonl:
+        return open(args.output, 'wb')
+    return contextlib.nullcontext()
+
+
+def _write_jsonl(f, record: dict):
+    """Dopisuje jeden rekord i opróżnia bufor - przerwany batch zostawia gotowe wyniki."""
+    f.write(_json_bytes(record) + b'\n')
+    f.flush()
+
+
+class _BufferedLines:
+    """
+    Wypisuje linie na stdout paczkami po `every` zamiast po jednej.
+
+    Przy stdout przekierowanym do pliku/potoku (zwłaszcza z python -u) to
+    jedno write+flush na paczkę zamiast na każdy plik. W terminalu linie
+    idą od razu, żeby było widać postęp.
+    """
+
+    def __init__(self, every: int = 64):
+        self.every = 1 if sys.stdout.isatty() else every
+        self._lines = []
+
+    def add(self, line: str):
+        self._lines.append(line)
+        if len(self._lines) >= self.every:
+            self.flush()
+
+    def flush(self):
+        if self._lines:
+            sys.stdout.write('\n'.join(self._lines) + '\n')
+            sys.stdout.flush()
+            self._lines.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+
+def _iter_batch_files(root):
+    """
+    Zwraca ścieżki (str) obsługiwanych plików z drzewa katalogów.
+
+    os.walk korzysta z wpisów os.scandir, więc nazwy i typy plików są brane
+    z odczytu katalogu - bez obiektu Path i stat() dla każdego wpisu.
+    """
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if name.lower().endswith(BATCH_EXTENSIONS):
+                yield os.path.join(dirpath, name)
+
+
+def _file_digest(path: Path, chunk_size: int = 8 * 1024 * 1024) -> str:
+    """Skrót zawartości pliku (BLAKE3 jeśli dostępny, inaczej SHA-256), czytanego porcjami."""
+    if blake3 is not None:
+        digest = blake3.blake3(max_threads=blake3.blake3.AUTO)
+    else:
+        digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _drop_identical_files(files):
+    """
+    Pomija pliki o identycznej zawartości (zostaje pierwszy), zanim trafią do OCR.
+
+    Działa strumieniowo. Hashujemy tylko pliki, których rozmiar już wystąpił -
+    unikalny rozmiar wyklucza duplikat bez czytania pliku.
+    """
+    first_by_size = {}  # rozmiar -> pierwszy plik (None gdy już zahashowany)
+    first_by_digest = {}
+
+    for f in files:
+        size = os.stat(f).st_size
+        if size not in first_by_size:
+            first_by_size[size] = f
+            yield f
+            continue
+
+        first = first_by_size[size]
+        if first is not None:
+            first_by_digest.setdefault(_file_digest(first), first)
+            first_by_size[size] = None
+
+        digest = _file_digest(f)
+        if digest in first_by_digest:
+            logger.info(f"Skipping duplicate (identical file): {f} = {first_by_digest[digest]}")
+            continue
+
+        first_by_digest[digest] = f
+        yield f
+
 
 def cmd_process(args):
     """Przetwarza pliki i generuje ID."""
-    from . import DocumentPipeline, OCREngine
-
-    engine = OCREngine.PADDLE if args.engine == 'paddle' else OCREngine.TESSERACT
-    pipeline = DocumentPipeline(
-        ocr_engine=engine,
-        id_prefix=args.prefix,
-        lang=args.lang,
-        use_gpu=args.gpu,
-    )
+    pipeline = _pipeline_from_args(args)
 
     results = []
 
+    files = []
     for file_path in args.files:
         file_path = Path(file_path)
 
@@ -58,8 +187,16 @@ def cmd_process(args):
             logger.error(f"File not found: {file_path}")
             continue
 
-        try:
-            result = pipeline.process(file_path)
+        files.append(file_path)
+
+    with _open_jsonl(args) as jsonl, _BufferedLines() as out:
+        # Błędy pojedynczych plików loguje pipeline, tu dostajemy sam wyjątek
+        for file_path, result in pipeline.process_batch_stream(
+                files, workers=args.workers, return_exceptions=True):
+            if isinstance(result, Exception):
+                if args.verbose:
+                    traceback.print_exception(type(result), result, result.__traceback__)
+                continue
 
             output = {
                 'file': str(file_path),
@@ -79,22 +216,19 @@ def cmd_process(args):
                 }
                 output['canonical_string'] = result.canonical_string
 
-            results.append(output)
+            if jsonl:
+                _write_jsonl(jsonl, output)
+            else:
+                results.append(output)
 
             if not args.quiet:
-                print(f"{file_path}: {result.document_id}")
+                out.add(f"{file_path}: {result.document_id}")
                 if result.is_duplicate:
-                    print(f"  ⚠ Duplicate of: {result.duplicate_of}")
-
-        except Exception as e:
-            logger.error(f"Error processing {file_path}: {e}")
-            if args.verbose:
-                import traceback
-                traceback.print_exc()
+                    out.add(f"  ⚠ Duplicate of: {result.duplicate_of}")
 
     if args.output:
-        with open(args.output, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        if not args.jsonl:
+            _save_json(args.output, results)
         print(f"\nResults saved to: {args.output}")
 
     return results
@@ -102,59 +236,72 @@ def cmd_process(args):
 
 def cmd_batch(args):
     """Przetwarza wszystkie pliki z katalogu."""
-    from . import DocumentPipeline, OCREngine
-
     directory = Path(args.directory)
     if not directory.is_dir():
         logger.error(f"Not a directory: {directory}")
         sys.exit(1)
 
-    # Znajdź pliki
-    extensions = {'.pdf', '.png', '.jpg', '.jpeg', '.tiff', '.bmp'}
-    files = [
-        f for f in directory.rglob('*')
-        if f.suffix.lower() in extensions
-    ]
+    # Znajdź pliki - leniwie, bez budowania listy całego drzewa katalogów
+    files = _iter_batch_files(directory)
 
-    if not files:
+    first = next(files, None)
+    if first is None:
         logger.warning(f"No supported files found in {directory}")
         sys.exit(0)
+    files = itertools.chain([first], files)
+
+    logger.info(f"Processing files from {directory}")
 
-    logger.info(f"Found {len(files)} files to process")
+    # Identyczne bajtowo pliki dałyby ten sam ID - nie płacimy za ich OCR
+    if not args.keep_duplicates:
+        files = _drop_identical_files(files)
 
     # Przetwarzanie
-    engine = OCREngine.PADDLE if args.engine == 'paddle' else OCREngine.TESSERACT
-    pipeline = DocumentPipeline(
-        ocr_engine=engine,
-        id_prefix=args.prefix,
-        lang=args.lang,
-        use_gpu=args.gpu,
-    )
+    pipeline = _pipeline_from_args(args)
 
-    results = pipeline.process_batch(
-        files,
-        skip_duplicates=not args.keep_duplicates,
-    )
+    # Pierwsze wywołanie modelu na GPU płaci za autotuning cuDNN i alokację
+    # pamięci - robimy je na pustych stronach, zanim ruszy właściwy batch
+    warmup = args.gpu if args.warmup is None else args.warmup
+
+    processed = 0
+    duplicates = 0
+    by_type = {}
+    output_data = []
+
+    with _open_jsonl(args) as jsonl:
+        for file_path, result in pipeline.process_batch_stream(
+            files, workers=args.workers, warmup=warmup,
+        ):
+            if result is None:
+                continue
+
+            if result.is_duplicate and not args.keep_duplicates:
+                logger.info(f"Skipping duplicate: {file_path}")
+                continue
+
+            processed += 1
+            duplicates += result.is_duplicate
+            t = result.document_type.value
+            by_type[t] = by_type.get(t, 0) + 1
+
+            if jsonl:
+                _write_jsonl(jsonl, result.to_dict())
+            elif args.output:
+                output_data.append(result.to_dict())
 
     # Raport
     print(f"\n{'='*60}")
-    print(f"Processed: {len(results)} documents")
-    print(f"Duplicates found: {sum(1 for r in results if r.is_duplicate)}")
+    print(f"Processed: {processed} documents")
+    print(f"Duplicates found: {duplicates}")
     print(f"{'='*60}\n")
 
     # Zapisz wyniki
     if args.output:
-        output_data = [r.to_dict() for r in results]
-        with open(args.output, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False, default=str)
+        if not args.jsonl:
+            _save_json(args.output, output_data)
         print(f"Results saved to: {args.output}")
 
     # Podsumowanie po typach
-    by_type = {}
-    for r in results:
-        t = r.document_type.value
-        by_type[t] = by_type.get(t, 0) + 1
-
     print("\nBy document type:")
     for t, count in sorted(by_type.items()):
         print(f"  {t}: {count}")
@@ -162,16 +309,10 @@ def cmd_batch(args):
 
 def cmd_verify(args):
     """Weryfikuje czy dokument ma oczekiwany ID."""
-    from . import DocumentPipeline, OCREngine
-
-    engine = OCREngine.PADDLE if args.engine == 'paddle' else OCREngine.TESSERACT
-    pipeline = DocumentPipeline(
-        ocr_engine=engine,
-        id_prefix=args.prefix,
-        lang=args.lang,
-    )
+    pipeline = _pipeline_from_args(args)
 
-    result = pipeline.process(args.file)
+    # Dla PDF OCR kończy się na pierwszej stronie, po której ID już się zgadza
+    result = pipeline.process_until_match(args.file, args.expected_id)
 
     if result.document_id == args.expected_id:
         print(f"✓ MATCH: {result.document_id}")
@@ -185,14 +326,7 @@ def cmd_verify(args):
 
 def cmd_ocr(args):
     """Wykonuje tylko OCR bez generowania ID."""
-    from . import OCREngine, OCRProcessor
-
-    engine = OCREngine.PADDLE if args.engine == 'paddle' else OCREngine.TESSERACT
-    processor = OCRProcessor(
-        preferred_engine=engine,
-        lang=args.lang,
-        use_gpu=args.gpu,
-    )
+    processor = _pipeline_from_args(args).ocr
 
     result = processor.process(args.file)
 
@@ -307,55 +441,122 @@ def cmd_visual(args):
         print("\nBrak dopasowania w progu — prawdopodobnie nowy dokument.")
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description='DOC Document ID Generator - deterministyczne ID dokumentów z OCR',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
+def _pipeline_from_args(args):
+    """Zwraca współdzielony pipeline skonfigurowany wspólnymi opcjami CLI."""
+    from . import OCREngine, get_pipeline
+
+    engine = OCREngine.PADDLE if args.engine == 'paddle' else OCREngine.TESSERACT
+    return get_pipeline(
+        ocr_engine=engine,
+        id_prefix=args.prefix,
+        lang=args.lang,
+        use_gpu=args.gpu,
+        enable_hpi=args.hpi,
+        precision=args.precision,
+        backend=args.backend,
+        rec_batch_num=args.rec_batch_num,
+        normalize_size=args.normalize_size,
+        gpu_mem=args.gpu_mem,
+        pdf_threads=_pdf_threads(args),
     )
-    parser.add_argument('--version', action='version', version='docid 0.1.0')
 
-    subparsers = parser.add_subparsers(dest='command', help='Dostępne komendy')
 
-    # Wspólne argumenty
+def _pdf_threads(args) -> int:
+    """Wątki renderowania PDF: jawna wartość albo rdzenie podzielone między workery."""
+    if args.pdf_threads is not None:
+        return max(1, args.pdf_threads)
+    workers = max(1, getattr(args, 'workers', 1))
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+def _parse_size(value: str) -> tuple:
+    """Parsuje rozmiar w formacie SZERxWYS, np. 1920x1440."""
+    try:
+        width, height = (int(v) for v in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got: {value}")
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError(f"size must be positive: {value}")
+    return width, height
+
+
+def _common_parser() -> argparse.ArgumentParser:
+    """Wspólne argumenty komend korzystających z OCR."""
     common = argparse.ArgumentParser(add_help=False)
     common.add_argument('--engine', choices=['paddle', 'tesseract'], default='paddle',
                        help='Silnik OCR (domyślnie: paddle)')
     common.add_argument('--lang', default='pl', help='Język dokumentów')
     common.add_argument('--prefix', default='DOC', help='Prefiks ID')
     common.add_argument('--gpu', action='store_true', help='Użyj GPU')
+    common.add_argument('--gpu-mem', type=int, metavar='MB',
+                       help='Wstępna pula pamięci GPU dla PaddleOCR w MB (z --gpu)')
+    common.add_argument('--hpi', action='store_true',
+                       help='Wysokowydajna inferencja PaddleOCR (TensorRT/ONNX Runtime/OpenVINO)')
+    common.add_argument('--precision', choices=['fp32', 'fp16'],
+                       help='Precyzja inferencji PaddleOCR')
+    common.add_argument('--backend', choices=['paddle', 'onnxruntime', 'openvino', 'tensorrt'],
+                       help='Backend inferencji dla --hpi (domyślnie automatyczny)')
+    common.add_argument('--rec-batch-num', type=int, default=None,
+                       help='Batch rozpoznawania PaddleOCR (domyślnie 1 na CPU, 6 na GPU)')
+    common.add_argument('--normalize-size', type=_parse_size, metavar='WxH',
+                       help='Skaluj strony do stałego rozmiaru przed OCR, np. 1920x1440 '
+                            '(PaddleOCR, przyspiesza batch na GPU)')
+    common.add_argument('--pdf-threads', type=int, default=None,
+                       help='Wątki renderowania stron PDF (domyślnie liczba CPU / --workers)')
     common.add_argument('-v', '--verbose', action='store_true', help='Więcej szczegółów')
+    return common
+
 
-    # process
+def _build_process(subparsers, common):
+    """Podkomenda process."""
     p_process = subparsers.add_parser('process', parents=[common],
                                        help='Przetwórz pliki i wygeneruj ID')
     p_process.add_argument('files', nargs='+', help='Pliki do przetworzenia')
     p_process.add_argument('-o', '--output', help='Zapisz wyniki do JSON')
+    p_process.add_argument('--jsonl', action='store_true',
+                          help='Zapisuj --output jako JSON Lines, rekord po rekordzie')
     p_process.add_argument('-q', '--quiet', action='store_true', help='Cichy tryb')
+    p_process.add_argument('--workers', type=int, default=1,
+                          help='Liczba równoległych workerów OCR (domyślnie 1, maks. liczba CPU)')
     p_process.set_defaults(func=cmd_process)
 
-    # batch
+
+def _build_batch(subparsers, common):
+    """Podkomenda batch."""
     p_batch = subparsers.add_parser('batch', parents=[common],
                                      help='Przetwórz cały katalog')
     p_batch.add_argument('directory', help='Katalog z dokumentami')
     p_batch.add_argument('-o', '--output', help='Zapisz wyniki do JSON')
+    p_batch.add_argument('--jsonl', action='store_true',
+                        help='Zapisuj --output jako JSON Lines, rekord po rekordzie')
     p_batch.add_argument('--keep-duplicates', action='store_true',
                         help='Zachowaj duplikaty w wynikach')
+    p_batch.add_argument('--workers', type=int, default=1,
+                        help='Liczba równoległych workerów OCR (domyślnie 1, maks. liczba CPU)')
+    p_batch.add_argument('--warmup', action=argparse.BooleanOptionalAction, default=None,
+                        help='Rozgrzej silnik OCR przed batchem (domyślnie tylko z --gpu)')
     p_batch.set_defaults(func=cmd_batch)
 
-    # verify
+
+def _build_verify(subparsers, common):
+    """Podkomenda verify."""
     p_verify = subparsers.add_parser('verify', parents=[common],
                                       help='Zweryfikuj ID dokumentu')
     p_verify.add_argument('file', help='Plik do weryfikacji')
     p_verify.add_argument('expected_id', help='Oczekiwany ID')
     p_verify.set_defaults(func=cmd_verify)
 
-    # ocr
+
+def _build_ocr(subparsers, common):
+    """Podkomenda ocr."""
     p_ocr = subparsers.add_parser('ocr', parents=[common],
                                    help='Wykonaj tylko OCR')
     p_ocr.add_argument('file', help='Plik do OCR')
     p_ocr.set_defaults(func=cmd_ocr)
 
-    # generate-id
+
+def _build_generate_id(subparsers, common):
+    """Podkomenda generate-id."""
     p_gen = subparsers.add_parser('generate-id',
                                    help='Wygeneruj ID z podanych danych (bez OCR)')
     p_gen.add_argument('--type', required=True,
@@ -369,7 +570,9 @@ def main():
     p_gen.add_argument('--prefix', default='DOC', help='Prefiks ID')
     p_gen.set_defaults(func=cmd_generate_id)
 
-    # visual - graficzna identyfikacja przed OCR
+
+def _build_visual(subparsers, common):
+    """Podkomenda visual - graficzna identyfikacja przed OCR."""
     p_visual = subparsers.add_parser('visual',
                                      help='Wizualny odcisk i podobieństwo obrazów (przed OCR)')
     p_visual.add_argument('image', help='Obraz do odcisku / porównania')
@@ -379,7 +582,54 @@ def main():
                          help='Maks. odległość Hamminga dla "ten sam dokument" (domyślnie 6)')
     p_visual.set_defaults(func=cmd_visual)
 
-    args = parser.parse_args()
+
+# Budowa podparserów na żądanie: wywołanie konkretnej komendy buduje tylko
+# jej parser (liczy się przy uruchamianiu docid w pętli po tysiącach plików).
+_SUBCOMMANDS = {
+    'process': _build_process,
+    'batch': _build_batch,
+    'verify': _build_verify,
+    'ocr': _build_ocr,
+    'generate-id': _build_generate_id,
+    'visual': _build_visual,
+}
+
+
+def main(argv=None):
+    # Wewnętrzne wątki OpenMP Tesseracta skalują się słabo - równoległość
+    # zapewniamy procesami (--workers), a każdy Tesseract działa na 1 wątku.
+    # Ustawiamy przed pierwszym użyciem silnika OCR; nie nadpisujemy wartości
+    # ustawionej przez użytkownika.
+    os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
+    if argv is None:
+        argv = sys.argv[1:]
+
+    parser = argparse.ArgumentParser(
+        description='DOC Document ID Generator - deterministyczne ID dokumentów z OCR',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--version', action='version', version='docid 0.1.0')
+
+    subparsers = parser.add_subparsers(dest='command', help='Dostępne komendy')
+    common = _common_parser()
+
+    # Pełne drzewo tylko dla --help, --version i nieznanych komend
+    command = argv[0] if argv else None
+    if command in _SUBCOMMANDS:
+        _SUBCOMMANDS[command](subparsers, common)
+    else:
+        for build in _SUBCOMMANDS.values():
+            build(subparsers, common)
+
+    args = parser.parse_args(argv)
+
+    # Konfiguracja logowania - dopiero tutaj, żeby import docid.cli nie
+    # przestawiał logowania aplikacji, która go używa
+    logging.basicConfig(
+        level=logging.INFO if getattr(args, 'verbose', False) else logging.WARNING,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
 
     if not args.command:
         parser.print_help()
@@ -4,8 +4,14 @@ Universal Document ID CLI - Complete command-line interface
 """
 
 import argparse
+import contextlib
+import itertools
 import json
+import re
 import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 import os
@@ -16,14 +22,62 @@ from .document_id import (
     generate_contract_id,
     DocumentIDGenerator,
 )
-from .document_id_universal import (
-    UniversalDocumentIDGenerator,
-    generate_universal_document_id,
-    verify_universal_document_id,
-    compare_universal_documents
-)
-from .pipeline import process_document, get_pipeline, DocumentPipeline
-from .ocr_processor import OCREngine
+
+# orjson is optional (pip install docid[fast]); it serializes large batch
+# outputs several times faster than the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# OCR pipeline and universal (PIL/NumPy/PyMuPDF) modules are imported inside
+# the commands that need them, so --help and `generate` start instantly.
+
+# Every business and universal ID ends with "-" + 16 upper-case hex digits
+_ID_HASH_SUFFIX = re.compile(r'-[0-9A-F]{16}$')
+
+
+def _dumps(obj, indent: bool = True) -> bytes:
+    """Serialize to UTF-8 JSON (indented or single-line), via orjson when available"""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, option=option | orjson.OPT_NON_STR_KEYS, default=str)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=str).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
+
+
+def _print_json(obj):
+    """Write JSON straight to the stdout byte stream"""
+    data = _dumps(obj)
+    buffer = getattr(sys.stdout, 'buffer', None)
+    if buffer is None:  # stdout replaced by a text-only stream
+        print(data.decode('utf-8'))
+        return
+    sys.stdout.flush()
+    buffer.write(data + b'\n')
+    buffer.flush()
+
+
+def _doc_type_value(result, default=None):
+    """Document type code of a pipeline result, or default when unknown"""
+    doc_type = result.document_type
+    return doc_type.value if doc_type else default
+
+
+@lru_cache(maxsize=256)
+def _cached_process(path_key: tuple, ocr_engine):
+    """Pipeline result keyed by (path, mtime_ns, size) - a modified file misses the cache"""
+    from .pipeline import get_pipeline
+    return get_pipeline(ocr_engine=ocr_engine).process(path_key[0])
+
+
+def _process_cached(file_path, ocr_engine=None):
+    """Process a file, skipping OCR for the same unchanged file seen before"""
+    from .ocr_processor import OCREngine
+    path = os.path.abspath(file_path)
+    st = os.stat(path)
+    return _cached_process((path, st.st_mtime_ns, st.st_size), ocr_engine or OCREngine.TESSERACT)
 
 
 def cmd_generate_business_id(args):
@@ -58,91 +112,106 @@ def cmd_generate_business_id(args):
 
 
 def cmd_generate_universal_id(args):
-    """Generate universal document ID"""
+    """Generate universal document ID(s); several files are hashed in parallel"""
+    from .document_id_universal import generate_universal_document_ids
+
     try:
-        doc_id = generate_universal_document_id(args.file)
-        print(doc_id)
-        return 0
+        doc_ids = generate_universal_document_ids(args.files, max_workers=args.workers,
+                                                  return_exceptions=True)
     except Exception as e:
         print(f"❌ Błąd generowania ID: {e}", file=sys.stderr)
         return 1
+    
+    # Błąd jednego pliku nie przerywa partii - pozostałe ID i tak są wypisywane
+    failed = 0
+    for file_path, doc_id in zip(args.files, doc_ids):
+        if isinstance(doc_id, Exception):
+            failed += 1
+            where = "" if len(args.files) == 1 else f" ({file_path})"
+            print(f"❌ Błąd generowania ID{where}: {doc_id}", file=sys.stderr)
+        elif len(args.files) == 1:
+            print(doc_id)
+        else:
+            print(f"{doc_id}  {file_path}")
+    return 1 if failed else 0
 
 
 def cmd_process_document(args):
     """Process document with full OCR and extraction"""
+    from .ocr_processor import OCREngine
+    from .pipeline import get_pipeline
+
     try:
         # Choose OCR engine
         ocr_engine = OCREngine.PADDLE
         if args.ocr == 'tesseract':
             ocr_engine = OCREngine.TESSERACT
         
-        # Create pipeline with specific settings
-        pipeline = DocumentPipeline(ocr_engine=ocr_engine)
+        # Shared pipeline - the OCR engine is initialized once per configuration
+        pipeline = get_pipeline(ocr_engine=ocr_engine)
         
         # Process document
         result = pipeline.process(args.file)
+        ext = result.extraction
+        doc_type = _doc_type_value(result)
+        ocr_text = result.ocr_result.full_text if result.ocr_result else ""
         
         # Output format
         if args.format == 'json':
-            ocr_text = result.ocr_result.full_text if result.ocr_result else ""
             output = {
                 'document_id': result.document_id,
-                'document_type': result.document_type.value if result.document_type else None,
+                'document_type': doc_type,
                 'confidence': result.ocr_confidence,
                 'extraction': None,
-                'ocr_text': ocr_text[:500] + '...' if ocr_text and len(ocr_text) > 500 else ocr_text
+                'ocr_text': ocr_text[:500] + '...' if len(ocr_text) > 500 else ocr_text
             }
             
-            if result.extraction:
+            if ext:
                 output['extraction'] = {
-                    'issuer_nip': result.extraction.issuer_nip,
-                    'buyer_nip': result.extraction.buyer_nip,
-                    'invoice_number': result.extraction.invoice_number,
-                    'issue_date': result.extraction.document_date,
-                    'gross_amount': result.extraction.gross_amount,
-                    'net_amount': result.extraction.net_amount,
-                    'vat_amount': result.extraction.vat_amount,
-                    'cash_register_number': result.extraction.cash_register_number,
-                    'contract_number': result.extraction.contract_number,
-                    'party1_nip': result.extraction.issuer_nip,
-                    'party2_nip': result.extraction.party2_nip,
-                    'contract_date': result.extraction.document_date
+                    'issuer_nip': ext.issuer_nip,
+                    'buyer_nip': ext.buyer_nip,
+                    'invoice_number': ext.invoice_number,
+                    'issue_date': ext.document_date,
+                    'gross_amount': ext.gross_amount,
+                    'net_amount': ext.net_amount,
+                    'vat_amount': ext.vat_amount,
+                    'cash_register_number': ext.cash_register_number,
+                    'contract_number': ext.contract_number,
+                    'party1_nip': ext.issuer_nip,
+                    'party2_nip': ext.party2_nip,
+                    'contract_date': ext.document_date
                 }
             
-            ocr_text = result.ocr_result.full_text if result.ocr_result else ""
-            output['ocr_text'] = ocr_text[:500] + '...' if ocr_text and len(ocr_text) > 500 else ocr_text
-            
-            print(json.dumps(output, indent=2, ensure_ascii=False))
+            _print_json(output)
         else:
             # Human readable format
             print(f"📄 Dokument: {args.file}")
             print(f"🆔 ID: {result.document_id}")
-            if result.document_type:
-                print(f"📋 Typ: {result.document_type.value}")
+            if doc_type:
+                print(f"📋 Typ: {doc_type}")
             print(f"🎯 Pewność OCR: {result.ocr_confidence:.2%}")
             if args.verbose:
                 print(f"🔗 Canonical: {result.canonical_string}")
             
-            if result.extraction:
+            if ext:
                 print("\n📊 Wyekstrahowane dane:")
-                if result.extraction.issuer_nip:
-                    print(f"  NIP sprzedawcy: {result.extraction.issuer_nip}")
-                if result.extraction.buyer_nip:
-                    print(f"  NIP nabywcy: {result.extraction.buyer_nip}")
-                if result.extraction.invoice_number:
-                    print(f"  Numer faktury: {result.extraction.invoice_number}")
-                if result.extraction.document_date:
-                    print(f"  Data: {result.extraction.document_date}")
-                if result.extraction.gross_amount:
-                    print(f"  Kwota brutto: {result.extraction.gross_amount}")
-                if result.extraction.cash_register_number:
-                    print(f"  Kasa fiskalna: {result.extraction.cash_register_number}")
-                if result.extraction.contract_number:
-                    print(f"  Numer umowy: {result.extraction.contract_number}")
-                if result.extraction.issuer_nip and result.extraction.party2_nip:
-                    print(f"  Strony umowy: {result.extraction.issuer_nip} ↔ {result.extraction.party2_nip}")
+                if ext.issuer_nip:
+                    print(f"  NIP sprzedawcy: {ext.issuer_nip}")
+                if ext.buyer_nip:
+                    print(f"  NIP nabywcy: {ext.buyer_nip}")
+                if ext.invoice_number:
+                    print(f"  Numer faktury: {ext.invoice_number}")
+                if ext.document_date:
+                    print(f"  Data: {ext.document_date}")
+                if ext.gross_amount:
+                    print(f"  Kwota brutto: {ext.gross_amount}")
+                if ext.cash_register_number:
+                    print(f"  Kasa fiskalna: {ext.cash_register_number}")
+                if ext.contract_number:
+                    print(f"  Numer umowy: {ext.contract_number}")
+                if ext.issuer_nip and ext.party2_nip:
+                    print(f"  Strony umowy: {ext.issuer_nip} ↔ {ext.party2_nip}")
             
-            ocr_text = result.ocr_result.full_text if result.ocr_result else ""
             if args.verbose and ocr_text:
                 print(f"\n📝 Tekst OCR:\n{ocr_text}")
         
@@ -154,13 +223,17 @@ def cmd_process_document(args):
 
 def cmd_verify_id(args):
     """Verify document ID"""
+    from .document_id_universal import verify_universal_document_id
+
     try:
-        if args.universal:
+        if not _ID_HASH_SUFFIX.search(args.id):
+            # Malformed ID can never match - skip hashing/OCR of the file
+            is_valid = False
+        elif args.universal:
             is_valid = verify_universal_document_id(args.file, args.id)
         else:
             # Use pipeline to verify business ID
-            pipeline = get_pipeline()
-            result = pipeline.process(args.file)
+            result = _process_cached(args.file)
             is_valid = result.document_id == args.id
         
         print(f"✅ Poprawny" if is_valid else "❌ Niepoprawny")
@@ -172,14 +245,35 @@ def cmd_verify_id(args):
 
 def cmd_compare_documents(args):
     """Compare two documents (Universal and Business)"""
+    from .document_id_universal import compare_universal_documents
+    from .pipeline import get_pipeline
+
     try:
-        # 1. Universal comparison
-        comparison = compare_universal_documents(args.file1, args.file2)
-        
-        # 2. Business ID comparison (using pipeline)
         pipeline = get_pipeline()
-        res1 = pipeline.process(args.file1)
-        res2 = pipeline.process(args.file2)
+        
+        # Universal comparison (file hashing) runs alongside OCR; the two OCR
+        # calls run concurrently only if the engine allows it
+        parallel_ocr = pipeline.ocr.is_thread_safe
+        # The same file given twice (also via a link) is OCR'd once - checked
+        # up front, because the result cache does not merge calls in flight
+        same_file = os.path.samefile(args.file1, args.file2)
+        
+        with ThreadPoolExecutor(max_workers=3 if parallel_ocr else 2) as executor:
+            # 1. Universal comparison
+            universal = executor.submit(compare_universal_documents, args.file1, args.file2)
+            
+            # 2. Business ID comparison (using pipeline)
+            if same_file:
+                res1 = res2 = _process_cached(args.file1)
+            elif parallel_ocr:
+                future1 = executor.submit(_process_cached, args.file1)
+                future2 = executor.submit(_process_cached, args.file2)
+                res1, res2 = future1.result(), future2.result()
+            else:
+                res1 = _process_cached(args.file1)
+                res2 = _process_cached(args.file2)
+            
+            comparison = universal.result()
         
         comparison['business_id1'] = res1.document_id
         comparison['business_id2'] = res2.document_id
@@ -188,7 +282,7 @@ def cmd_compare_documents(args):
         comparison['identical_business_ids'] = res1.document_id == res2.document_id
         
         if args.format == 'json':
-            print(json.dumps(comparison, indent=2, ensure_ascii=False))
+            _print_json(comparison)
         else:
             print(f"📄 Porównanie dokumentów:")
             print(f"  Plik 1: {args.file1}")
@@ -215,8 +309,9 @@ def cmd_compare_documents(args):
                     status = "✅" if val1 == val2 else "❌"
                     print(f"  {status} {label:10}: {val1} vs {val2}")
             
-            if res1.document_type:
-                print(f"\n📋 Typ: {res1.document_type.value}")
+            doc_type = _doc_type_value(res1)
+            if doc_type:
+                print(f"\n📋 Typ: {doc_type}")
 
             print(f"\n🌍 Identyfikatory Uniwersalne (Cechy pliku - czułe na format):")
             print(f"  Identyczne: {'✅' if comparison['identical_ids'] else '❌'}")
@@ -238,68 +333,108 @@ def cmd_compare_documents(args):
         return 1
 
 
+def _iter_files(directory, recursive: bool = False):
+    """Yield regular files in a directory (os.scandir based, no full listing up front)."""
+    if recursive:
+        for dirpath, _, filenames in os.walk(directory):
+            for name in filenames:
+                yield Path(dirpath, name)
+    else:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    yield Path(entry.path)
+
+
 def cmd_batch_process(args):
     """Process multiple documents"""
+    from .ocr_processor import OCREngine
+    from .pipeline import get_pipeline
+
     try:
         # Choose OCR engine
         ocr_engine = OCREngine.PADDLE
         if args.ocr == 'tesseract':
             ocr_engine = OCREngine.TESSERACT
         
-        # Get files
-        if args.recursive:
-            files = list(Path(args.directory).rglob("*"))
-        else:
-            files = list(Path(args.directory).glob("*"))
-        
-        files = [f for f in files if f.is_file()]
+        # Get files - lazily, OCR starts on the first file right away
+        files = _iter_files(args.directory, args.recursive)
+        first = next(files, None)
         
-        if not files:
+        if first is None:
             print(f"❌ Brak plików w folderze: {args.directory}", file=sys.stderr)
             return 1
         
-        print(f"📁 Przetwarzanie {len(files)} plików z {args.directory}")
+        files = itertools.chain([first], files)
+        total = None
+        if args.count:
+            files = list(files)
+            total = len(files)
+            print(f"📁 Przetwarzanie {total} plików z {args.directory}")
+        else:
+            print(f"📁 Przetwarzanie plików z {args.directory}")
         
-        # Process files
-        pipeline = DocumentPipeline(ocr_engine=ocr_engine)
-        results = []
+        # Process files - with --workers > 1 in a process pool (one OCR engine
+        # per worker), results still arrive in input order
+        pipeline = get_pipeline(ocr_engine=ocr_engine)
+        stream = pipeline.process_batch_stream(
+            files, workers=args.workers, return_exceptions=True,
+        )
+        
+        # Only the small per-file records are kept, not the full results
+        # (OCR text etc.). NDJSON lines are written as each file completes.
+        processed = 0
+        records = []
+        id_counts = defaultdict(list)
+        ndjson = args.output and args.output_format == 'ndjson'
         
-        for i, file_path in enumerate(files, 1):
-            try:
-                print(f"\n[{i}/{len(files)}] 📄 {file_path.name}", end="")
+        with (open(args.output, 'wb') if ndjson else contextlib.nullcontext()) as out:
+            progress = f"/{total}] 📄 " if total else "] 📄 "
+            for i, (file_path, result) in enumerate(stream, 1):
+                if isinstance(result, Exception):
+                    # Errors are reported even with --quiet
+                    print(f"\n[{i}{progress}{file_path.name} ❌ Błąd: {result}")
+                    if args.continue_on_error:
+                        continue
+                    else:
+                        return 1
                 
-                result = pipeline.process(str(file_path))
-                results.append(result)
+                processed += 1
+                if not args.quiet:
+                    # One write per file - the line is not split around the OCR call
+                    print(f"\n[{i}{progress}{file_path.name} → {result.document_id}")
+                    
+                    if args.verbose and result.extraction:
+                        print(f"   📊 {_doc_type_value(result, 'Unknown')}")
                 
-                print(f" → {result.document_id}")
+                if args.duplicates:
+                    id_counts[result.document_id].append(result.source_file)
                 
-                if args.verbose and result.extraction:
-                    print(f"   📊 {result.document_type.value if result.document_type else 'Unknown'}")
-                    
-            except Exception as e:
-                print(f" ❌ Błąd: {e}")
-                if args.continue_on_error:
-                    continue
-                else:
-                    return 1
+                if args.output:
+                    record = {
+                        'file': result.source_file,
+                        'id': result.document_id,
+                        'type': _doc_type_value(result),
+                        'confidence': result.ocr_confidence
+                    }
+                    if ndjson:
+                        out.write(_dumps(record, indent=False) + b'\n')
+                        out.flush()
+                    else:
+                        records.append(record)
         
         # Summary
-        print(f"\n✅ Przetworzono: {len(results)} plików")
+        print(f"\n✅ Przetworzono: {processed} plików")
         
         if args.duplicates:
             # Find duplicates
-            id_counts = {}
-            for result in results:
-                doc_id = result.document_id
-                if doc_id not in id_counts:
-                    id_counts[doc_id] = []
-                id_counts[doc_id].append(result.source_file)
-            
-            duplicates = {id_: files for id_, files in id_counts.items() if len(files) > 1}
+            dup_groups = sum(1 for files in id_counts.values() if len(files) > 1)
             
-            if duplicates:
-                print(f"\n🔍 Znalezione duplikaty ({len(duplicates)} grup):")
-                for doc_id, files in duplicates.items():
+            if dup_groups:
+                print(f"\n🔍 Znalezione duplikaty ({dup_groups} grup):")
+                for doc_id, files in id_counts.items():
+                    if len(files) < 2:
+                        continue
                     print(f"  {doc_id}:")
                     for file_path in files:
                         print(f"    - {file_path}")
@@ -308,17 +443,9 @@ def cmd_batch_process(args):
         
         # Save results if requested
         if args.output:
-            output_data = []
-            for result in results:
-                output_data.append({
-                    'file': result.source_file,
-                    'id': result.document_id,
-                    'type': result.document_type.value if result.document_type else None,
-                    'confidence': result.ocr_confidence
-                })
-            
-            with open(args.output, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
+            if not ndjson:
+                with open(args.output, 'wb') as f:
+                    f.write(_dumps(records))
             
             print(f"\n💾 Zapisano wyniki do: {args.output}")
         
@@ -330,6 +457,8 @@ def cmd_batch_process(args):
 
 def cmd_analyze_file(args):
     """Analyze file features (universal)"""
+    from .document_id_universal import UniversalDocumentIDGenerator
+
     try:
         generator = UniversalDocumentIDGenerator()
         features = generator.get_document_features(args.file)
@@ -350,7 +479,7 @@ def cmd_analyze_file(args):
                 'creation_time': features.creation_time,
                 'modification_time': features.modification_time
             }
-            print(json.dumps(output, indent=2, ensure_ascii=False))
+            _print_json(output)
         else:
             print(f"📄 Analiza pliku: {args.file}")
             print(f"\n📊 Podstawowe informacje:")
@@ -382,6 +511,10 @@ def cmd_analyze_file(args):
 
 def cmd_test_determinism(args):
     """Test ID determinism"""
+    from .document_id_universal import generate_universal_document_id
+    from .ocr_processor import OCREngine
+    from .pipeline import process_document
+
     try:
         print(f"🧪 Testowanie determinizmu dla: {args.file}")
         print(f"🔄 Liczba iteracji: {args.iterations}")
@@ -427,18 +560,8 @@ def cmd_test_determinism(args):
         return 1
 
 
-def main():
-    """Main CLI entry point"""
-    parser = argparse.ArgumentParser(
-        prog='docid',
-        description='DOC Document ID Generator - CLI'
-    )
-    
-    parser.add_argument('--version', action='version', version='%(prog)s 0.1.0')
-    
-    subparsers = parser.add_subparsers(dest='command', help='Dostępne komendy')
-    
-    # Generate business ID
+def _build_generate(subparsers):
+    """Generate business ID subcommand"""
     parser_gen = subparsers.add_parser('generate', help='Generuj ID dokumentu biznesowego')
     parser_gen.add_argument('type', choices=['invoice', 'receipt', 'contract'], help='Typ dokumentu')
     parser_gen.add_argument('--nip', required=True, help='NIP sprzedawcy/strony')
@@ -448,52 +571,76 @@ def main():
     parser_gen.add_argument('--register', help='Numer kasy fiskalnej (dla paragonów)')
     parser_gen.add_argument('--party2-nip', help='NIP drugiej strony (dla umów)')
     parser_gen.set_defaults(func=cmd_generate_business_id)
-    
-    # Generate universal ID
+
+
+def _build_universal(subparsers):
+    """Generate universal ID subcommand"""
     parser_univ = subparsers.add_parser('universal', help='Generuj uniwersalne ID dokumentu')
-    parser_univ.add_argument('file', help='Ścieżka do pliku')
+    parser_univ.add_argument('files', nargs='+', help='Ścieżka do pliku (można podać kilka)')
+    parser_univ.add_argument('--workers', '-w', type=int, default=None,
+                             help='Liczba wątków przy wielu plikach (domyślnie automatycznie)')
     parser_univ.set_defaults(func=cmd_generate_universal_id)
-    
-    # Process document
+
+
+def _build_process(subparsers):
+    """Process document subcommand"""
     parser_proc = subparsers.add_parser('process', help='Przetwarzaj dokument z OCR')
     parser_proc.add_argument('file', help='Ścieżka do pliku')
     parser_proc.add_argument('--format', choices=['text', 'json'], default='text', help='Format wyjściowy')
     parser_proc.add_argument('--ocr', choices=['paddle', 'tesseract', 'auto'], default='auto', help='Silnik OCR (domyślnie auto)')
     parser_proc.add_argument('-v', '--verbose', action='store_true', help='Szczegółowe informacje')
     parser_proc.set_defaults(func=cmd_process_document)
-    
-    # Verify ID
+
+
+def _build_verify(subparsers):
+    """Verify ID subcommand"""
     parser_verify = subparsers.add_parser('verify', help='Weryfikuj ID dokumentu')
     parser_verify.add_argument('file', help='Ścieżka do pliku')
     parser_verify.add_argument('id', help='ID do weryfikacji')
     parser_verify.add_argument('--universal', action='store_true', help='Uniwersalne ID')
     parser_verify.set_defaults(func=cmd_verify_id)
-    
-    # Compare documents
+
+
+def _build_compare(subparsers):
+    """Compare documents subcommand"""
     parser_compare = subparsers.add_parser('compare', help='Porównaj dwa dokumenty')
     parser_compare.add_argument('file1', help='Pierwszy plik')
     parser_compare.add_argument('file2', help='Drugi plik')
     parser_compare.add_argument('--format', choices=['text', 'json'], default='text', help='Format wyjściowy')
     parser_compare.set_defaults(func=cmd_compare_documents)
-    
-    # Batch process
+
+
+def _build_batch(subparsers):
+    """Batch process subcommand"""
     parser_batch = subparsers.add_parser('batch', help='Przetwarzaj wsadowe dokumenty')
     parser_batch.add_argument('directory', help='Folder z dokumentami')
     parser_batch.add_argument('--output', '-o', help='Plik wyjściowy (JSON)')
+    parser_batch.add_argument('--output-format', choices=['json', 'ndjson'], default='json',
+                              help='Format pliku wyjściowego: json (na końcu) lub ndjson (na bieżąco)')
     parser_batch.add_argument('--ocr', choices=['paddle', 'tesseract', 'auto'], default='auto', help='Silnik OCR (domyślnie auto)')
     parser_batch.add_argument('--recursive', '-r', action='store_true', help='Przetwarzaj rekurencyjnie')
     parser_batch.add_argument('--duplicates', '-d', action='store_true', help='Pokaż duplikaty')
     parser_batch.add_argument('--continue-on-error', action='store_true', help='Kontynuuj przy błędach')
+    parser_batch.add_argument('--count', action='store_true',
+                              help='Policz pliki przed startem (postęp jako i/N)')
+    parser_batch.add_argument('--workers', '-w', type=int, default=1,
+                              help='Liczba równoległych procesów OCR (domyślnie 1)')
+    parser_batch.add_argument('-q', '--quiet', action='store_true',
+                              help='Cichy tryb - bez postępu dla każdego pliku, tylko podsumowanie')
     parser_batch.add_argument('-v', '--verbose', action='store_true', help='Szczegółowe informacje')
     parser_batch.set_defaults(func=cmd_batch_process)
-    
-    # Analyze file
+
+
+def _build_analyze(subparsers):
+    """Analyze file subcommand"""
     parser_analyze = subparsers.add_parser('analyze', help='Analizuj cechy pliku')
     parser_analyze.add_argument('file', help='Ścieżka do pliku')
     parser_analyze.add_argument('--format', choices=['text', 'json'], default='text', help='Format wyjściowy')
     parser_analyze.set_defaults(func=cmd_analyze_file)
-    
-    # Test determinism
+
+
+def _build_test(subparsers):
+    """Test determinism subcommand"""
     parser_test = subparsers.add_parser('test', help='Test determinizmu ID')
     parser_test.add_argument('file', help='Ścieżka do pliku')
     parser_test.add_argument('--iterations', '-n', type=int, default=10, help='Liczba iteracji')
@@ -501,9 +648,45 @@ def main():
     parser_test.add_argument('--ocr', choices=['paddle', 'tesseract', 'auto'], default='auto', help='Silnik OCR (domyślnie auto)')
     parser_test.add_argument('-v', '--verbose', action='store_true', help='Pokaż wszystkie iteracje')
     parser_test.set_defaults(func=cmd_test_determinism)
+
+
+_SUBCOMMANDS = {
+    'generate': _build_generate,
+    'universal': _build_universal,
+    'process': _build_process,
+    'verify': _build_verify,
+    'compare': _build_compare,
+    'batch': _build_batch,
+    'analyze': _build_analyze,
+    'test': _build_test,
+}
+
+
+def main(argv=None):
+    """Main CLI entry point"""
+    if argv is None:
+        argv = sys.argv[1:]
+    
+    parser = argparse.ArgumentParser(
+        prog='docid',
+        description='DOC Document ID Generator - CLI'
+    )
+    
+    parser.add_argument('--version', action='version', version='%(prog)s 0.1.0')
+    
+    subparsers = parser.add_subparsers(dest='command', help='Dostępne komendy')
+    
+    # Build only the requested subcommand; the full tree is needed just for
+    # --help, --version and unknown commands
+    command = argv[0] if argv else None
+    if command in _SUBCOMMANDS:
+        _SUBCOMMANDS[command](subparsers)
+    else:
+        for build in _SUBCOMMANDS.values():
+            build(subparsers)
     
     # Parse arguments
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     if not args.command:
         parser.print_help()
@@ -6,17 +6,79 @@ niezależnie od formatu źródłowego (skan, PDF, KSeF XML).
 """
 
 import hashlib
+import hmac
 import re
+import sys
 import uuid
 from dataclasses import dataclass
 from datetime import date, datetime
 from decimal import ROUND_HALF_UP, Decimal
 from enum import Enum
-from typing import Optional, Union
+from functools import lru_cache
+from typing import Iterable, List, Optional, Union
 
 # Namespace UUID dla DOC (RFC 4122 UUID v5)
 DOC_NAMESPACE = uuid.UUID('a1b2c3d4-e5f6-7890-abcd-ef1234567890')
 
+# Wzorce normalizacji - kompilowane raz, używane przy każdym generowaniu ID
+_DIGITS_RE = re.compile(r'\d+')
+_ACCOUNT_RE = re.compile(r'[\s\-]')
+
+# Wagi sumy kontrolnej NIP i tablica iloczynów waga*cyfra, indeksowana kodem
+# bajtu cyfry ASCII (b'0' == 48)
+_NIP_WEIGHTS = (6, 5, 7, 2, 3, 4, 5, 6, 7)
+_NIP_PRODUCTS = tuple(
+    tuple(weight * (code - 48) if 48 <= code <= 57 else 0 for code in range(58))
+    for weight in _NIP_WEIGHTS
+)
+
+# Funkcje skrótu dla części HASH16 identyfikatora (8 bajtów). SHA-256 jest
+# domyślny - zmiana algorytmu zmienia wszystkie ID, więc BLAKE2b (szybszy dla
+# krótkich ciągów kanonicznych) jest tylko opcją dla nowych wdrożeń.
+def _sha256_digest8(data: bytes) -> bytes:
+    return hashlib.sha256(data).digest()[:8]
+
+
+def _blake2b_digest8(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=8).digest()
+
+
+_ID_DIGESTS = {
+    'sha256': _sha256_digest8,
+    'blake2b': _blake2b_digest8,
+}
+
+
+# Skrót nazwy płatnika/odbiorcy w KP/KW (8 znaków hex) - MD5 w domyślnym
+# schemacie ID, BLAKE2s (bez przycinania, szybszy) razem z hash_algo='blake2b'
+def _md5_name_hash(data: bytes) -> str:
+    return hashlib.md5(data).hexdigest()[:8]
+
+
+def _blake2s_name_hash(data: bytes) -> str:
+    return hashlib.blake2s(data, digest_size=4).hexdigest()
+
+
+_NAME_HASHES = {
+    'sha256': _md5_name_hash,
+    'blake2b': _blake2s_name_hash,
+}
+
+# Kwant zaokrąglenia kwot (grosze)
+_CENT = Decimal('0.01')
+
+# Znaki białe - ten sam zbiór co \s w wyrażeniach regularnych (str)
+_WHITESPACE = (
+    '\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680'
+    '\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a'
+    '\u2028\u2029\u202f\u205f\u3000'
+)
+
+# Tablice str.translate - jedno przejście po znakach zamiast kilku re.sub
+_NIP_STRIP = str.maketrans('', '', _WHITESPACE + '-.')
+_AMOUNT_STRIP = str.maketrans('', '', _WHITESPACE + 'ZŁPLN')
+_INV_SEPARATORS = str.maketrans(dict.fromkeys(_WHITESPACE + '-_', '/'))
+
 
 class DocumentType(Enum):
     """Typy dokumentów obsługiwane przez system."""
@@ -37,7 +99,15 @@ class DocumentType(Enum):
     OTHER = "DOC"            # Inny dokument
 
 
-@dataclass
+# Kod typu -> DocumentType (parse_id; bez wyjątku dla nieznanych kodów)
+_TYPE_BY_CODE = {dt.value: dt for dt in DocumentType}
+
+
+# slots=True (Python 3.10+) - instancje bez __dict__, tworzone przy każdym ID
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class CanonicalData:
     """Kanoniczne dane dokumentu do generowania ID."""
     document_type: DocumentType
@@ -60,12 +130,21 @@ class NIPValidator:
         >>> NIPValidator.normalize("PL 521 301 72 28")
         '5213017228'
         """
+        if isinstance(nip, str):
+            return _normalize_nip(nip)
+        return NIPValidator._normalize(nip)
+
+    @staticmethod
+    def _normalize(nip: str) -> str:
+        """Właściwa normalizacja, bez cache."""
         if not nip:
             return ""
         # Usuń prefiks kraju, spacje, myślniki
-        cleaned = re.sub(r'^[A-Z]{2}', '', nip.upper())
-        cleaned = re.sub(r'[\s\-\.]', '', cleaned)
-        return cleaned
+        cleaned = nip.upper()
+        prefix = cleaned[:2]
+        if len(prefix) == 2 and prefix.isascii() and prefix.isalpha():
+            cleaned = cleaned[2:]
+        return cleaned.translate(_NIP_STRIP)
 
     @staticmethod
     def validate(nip: str) -> bool:
@@ -79,9 +158,18 @@ class NIPValidator:
         if len(nip) != 10 or not nip.isdigit():
             return False
 
-        weights = [6, 5, 7, 2, 3, 4, 5, 6, 7]
-        checksum = sum(int(nip[i]) * weights[i] for i in range(9))
-        return checksum % 11 == int(nip[9])
+        if not nip.isascii():
+            # Cyfry spoza ASCII (np. pełnej szerokości) - ścieżka ogólna
+            checksum = sum(int(nip[i]) * _NIP_WEIGHTS[i] for i in range(9))
+            return checksum % 11 == int(nip[9])
+
+        b = nip.encode('ascii')
+        p = _NIP_PRODUCTS
+        checksum = (
+            p[0][b[0]] + p[1][b[1]] + p[2][b[2]] + p[3][b[3]] + p[4][b[4]]
+            + p[5][b[5]] + p[6][b[6]] + p[7][b[7]] + p[8][b[8]]
+        )
+        return checksum % 11 == b[9] - 48
 
 
 class AmountNormalizer:
@@ -97,31 +185,47 @@ class AmountNormalizer:
         >>> AmountNormalizer.normalize(1230.5)
         '1230.50'
         """
+        if isinstance(amount, str):
+            return _normalize_amount(amount)
+        return AmountNormalizer._normalize(amount)
+
+    @staticmethod
+    def _normalize(amount: Union[str, float, Decimal]) -> str:
+        """Właściwa normalizacja, bez cache."""
         if isinstance(amount, (int, float)):
-            return f"{Decimal(str(amount)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)}"
+            return str(Decimal(str(amount)).quantize(_CENT, rounding=ROUND_HALF_UP))
 
         # Parsowanie stringa
         cleaned = str(amount).upper()
         # Usuń walutę i spacje
-        cleaned = re.sub(r'[ZŁPLN\s]', '', cleaned)
+        cleaned = cleaned.translate(_AMOUNT_STRIP)
         # Zamień przecinek na kropkę
         cleaned = cleaned.replace(',', '.')
-        # Usuń separatory tysięcy (spacje lub kropki przed ostatnią kropką)
+        # Usuń separatory tysięcy (kropki przed ostatnią kropką; spacje
+        # zostały już usunięte)
         parts = cleaned.rsplit('.', 1)
         if len(parts) == 2:
-            integer_part = re.sub(r'[\.\s]', '', parts[0])
+            integer_part = parts[0].replace('.', '')
             decimal_part = parts[1]
             cleaned = f"{integer_part}.{decimal_part}"
-        else:
-            cleaned = re.sub(r'[\.\s]', '', cleaned)
 
         try:
-            decimal_val = Decimal(cleaned).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+            decimal_val = Decimal(cleaned).quantize(_CENT, rounding=ROUND_HALF_UP)
             return str(decimal_val)
         except Exception:
             return "0.00"
 
 
+def _iso_date(value: date) -> str:
+    """Data (lub datetime) jako YYYY-MM-DD - isoformat() zamiast strftime."""
+    if value.year < 1000:
+        # strftime nie dopełnia zerami lat < 1000 (glibc) - zostaje jak było
+        return value.strftime('%Y-%m-%d')
+    if isinstance(value, datetime):
+        value = value.date()
+    return value.isoformat()
+
+
 class DateNormalizer:
     """Normalizator dat."""
 
@@ -145,22 +249,62 @@ class DateNormalizer:
         >>> DateNormalizer.normalize("2025-01-15")
         '2025-01-15'
         """
-        if isinstance(date_str, datetime):
-            return date_str.strftime('%Y-%m-%d')
-        if isinstance(date_str, date):
-            return date_str.strftime('%Y-%m-%d')
+        if isinstance(date_str, str):
+            return _normalize_date(date_str)
+        return DateNormalizer._normalize(date_str)
+
+    @staticmethod
+    def _normalize(date_str: Union[str, date, datetime]) -> str:
+        """Właściwa normalizacja, bez cache."""
+        if isinstance(date_str, date):  # także datetime
+            return _iso_date(date_str)
 
         cleaned = str(date_str).strip()
 
+        # Najczęstszy przypadek (KSeF XML): ISO YYYY-MM-DD bez strptime.
+        # Sprawdzenie pozycji myślników odrzuca inne formy ISO (np. tydzień
+        # 2025-W03-1), których strptime('%Y-%m-%d') nie przyjmuje.
+        if len(cleaned) == 10 and cleaned[4] == '-' and cleaned[7] == '-':
+            try:
+                return _iso_date(date.fromisoformat(cleaned))
+            except ValueError:
+                pass
+
+        # Pozostałe formaty o stałej długości - wycinki (rok, miesiąc, dzień)
+        # wg długości i pozycji separatorów, bez wyjątków z kolejnych strptime
+        fields = None
+        if len(cleaned) == 10:
+            separator = cleaned[2]
+            if separator in '.-/ ' and cleaned[5] == separator:      # DD.MM.YYYY
+                fields = (cleaned[6:], cleaned[3:5], cleaned[:2])
+            elif cleaned[4] == '/' and cleaned[7] == '/':            # YYYY/MM/DD
+                fields = (cleaned[:4], cleaned[5:7], cleaned[8:])
+        elif len(cleaned) == 8:                                       # YYYYMMDD
+            fields = (cleaned[:4], cleaned[4:6], cleaned[6:])
+        if fields and all(f.isascii() and f.isdigit() for f in fields):
+            try:
+                return _iso_date(date(*map(int, fields)))
+            except ValueError:
+                pass  # np. 31.02 - dalej jak dotychczas
+
+        # Format pasuje tylko, gdy tekst zawiera jego separator (znak między
+        # pierwszymi dyrektywami; spacja w formacie oznacza dowolny biały znak)
+        has_space = len(cleaned.split(None, 1)) > 1
         for fmt in DateNormalizer.FORMATS:
+            separator = fmt[2]
+            if separator == ' ':
+                if not has_space:
+                    continue
+            elif separator != '%' and separator not in cleaned:
+                continue
             try:
                 parsed = datetime.strptime(cleaned, fmt)
-                return parsed.strftime('%Y-%m-%d')
+                return _iso_date(parsed)
             except ValueError:
                 continue
 
         # Fallback - spróbuj wyciągnąć cyfry
-        digits = re.findall(r'\d+', cleaned)
+        digits = _DIGITS_RE.findall(cleaned)
         if len(digits) >= 3:
             # Zgaduj format na podstawie wartości
             if len(digits[0]) == 4:  # Rok pierwszy
@@ -171,6 +315,14 @@ class DateNormalizer:
         return cleaned  # Zwróć oryginał jeśli nie można sparsować
 
 
+# Te same NIP-y, daty i kwoty powtarzają się w tysiącach dokumentów - wyniki
+# normalizacji zapamiętujemy. Tylko dla str: równe liczby (0.0 i -0.0,
+# 1 i True) mają równe klucze, a różne wyniki.
+_normalize_nip = lru_cache(maxsize=4096)(NIPValidator._normalize)
+_normalize_amount = lru_cache(maxsize=4096)(AmountNormalizer._normalize)
+_normalize_date = lru_cache(maxsize=4096)(DateNormalizer._normalize)
+
+
 class InvoiceNumberNormalizer:
     """Normalizator numerów faktur."""
 
@@ -187,16 +339,10 @@ class InvoiceNumberNormalizer:
         if not number:
             return ""
 
-        # Uppercase
-        normalized = number.upper().strip()
-        # Zamień różne separatory na /
-        normalized = re.sub(r'[\s\-_]+', '/', normalized)
-        # Usuń podwójne /
-        normalized = re.sub(r'/+', '/', normalized)
-        # Usuń / na początku i końcu
-        normalized = normalized.strip('/')
-
-        return normalized
+        # Uppercase, różne separatory na /
+        normalized = number.upper().translate(_INV_SEPARATORS)
+        # Usuń podwójne / oraz / na początku i końcu
+        return '/'.join(filter(None, normalized.split('/')))
 
 
 class DocumentIDGenerator:
@@ -207,12 +353,31 @@ class DocumentIDGenerator:
     niezależnie od formatu źródłowego dokumentu.
     """
 
-    def __init__(self, prefix: str = "DOC"):
+    def __init__(self, prefix: str = "DOC", hash_algo: str = "sha256"):
         """
         Args:
             prefix: Prefiks identyfikatora (domyślnie DOC)
+            hash_algo: Funkcja skrótu - 'sha256' (domyślnie, dotychczasowe ID)
+                lub 'blake2b' (szybszy, ale daje inne ID; nazwy w KP/KW
+                skracane wtedy BLAKE2s zamiast MD5)
         """
+        if hash_algo not in _ID_DIGESTS:
+            raise ValueError(f"Unsupported hash algorithm: {hash_algo}")
         self.prefix = prefix
+        self.hash_algo = hash_algo
+        self._digest = _ID_DIGESTS[hash_algo]
+        self._name_hash = _NAME_HASHES[hash_algo]
+
+    @property
+    def prefix(self) -> str:
+        return self._prefix
+
+    @prefix.setter
+    def prefix(self, value: str):
+        # Gotowe początki ID "{PREFIX}-{TYP}-" dla każdego typu - bez
+        # odczytu Enum.value i formatowania przy każdym generowaniu
+        self._prefix = value
+        self._id_heads = {dt: f"{value}-{dt.value}-" for dt in DocumentType}
 
     def generate_invoice_id(
         self,
@@ -233,19 +398,12 @@ class DocumentIDGenerator:
         """
         canonical = CanonicalData(
             document_type=DocumentType.INVOICE,
-            canonical_string="|".join([
-                NIPValidator.normalize(seller_nip),
-                InvoiceNumberNormalizer.normalize(invoice_number),
-                DateNormalizer.normalize(issue_date),
-                AmountNormalizer.normalize(gross_amount),
-            ]),
-            raw_fields={
-                'seller_nip': seller_nip,
-                'invoice_number': invoice_number,
-                'issue_date': issue_date,
-                'gross_amount': gross_amount,
-                'buyer_nip': buyer_nip,
-            }
+            canonical_string=(
+                f"{NIPValidator.normalize(seller_nip)}"
+                f"|{InvoiceNumberNormalizer.normalize(invoice_number)}"
+                f"|{DateNormalizer.normalize(issue_date)}"
+                f"|{AmountNormalizer.normalize(gross_amount)}"
+            )
         )
         return self._generate_id(canonical)
 
@@ -281,14 +439,7 @@ class DocumentIDGenerator:
 
         canonical = CanonicalData(
             document_type=DocumentType.RECEIPT,
-            canonical_string="|".join(parts),
-            raw_fields={
-                'seller_nip': seller_nip,
-                'receipt_date': receipt_date,
-                'gross_amount': gross_amount,
-                'receipt_number': receipt_number,
-                'cash_register_number': cash_register_number,
-            }
+            canonical_string="|".join(parts)
         )
         return self._generate_id(canonical)
 
@@ -325,14 +476,7 @@ class DocumentIDGenerator:
 
         canonical = CanonicalData(
             document_type=DocumentType.CONTRACT,
-            canonical_string="|".join(parts),
-            raw_fields={
-                'party1_nip': party1_nip,
-                'party2_nip': party2_nip,
-                'contract_date': contract_date,
-                'contract_number': contract_number,
-                'contract_type': contract_type,
-            }
+            canonical_string="|".join(parts)
         )
         return self._generate_id(canonical)
 
@@ -348,7 +492,7 @@ class DocumentIDGenerator:
         Pola kanoniczne: Numer konta (26 cyfr) | Data | Numer wyciągu
         """
         # Normalizuj numer konta - tylko cyfry
-        account = re.sub(r'[\s\-]', '', account_number)
+        account = _ACCOUNT_RE.sub('', account_number)
 
         parts = [
             account,
@@ -360,12 +504,7 @@ class DocumentIDGenerator:
 
         canonical = CanonicalData(
             document_type=DocumentType.BANK_STATEMENT,
-            canonical_string="|".join(parts),
-            raw_fields={
-                'account_number': account_number,
-                'statement_date': statement_date,
-                'statement_number': statement_number,
-            }
+            canonical_string="|".join(parts)
         )
         return self._generate_id(canonical)
 
@@ -384,20 +523,13 @@ class DocumentIDGenerator:
         """
         canonical = CanonicalData(
             document_type=DocumentType.CORRECTION,
-            canonical_string="|".join([
-                NIPValidator.normalize(seller_nip),
-                InvoiceNumberNormalizer.normalize(correction_number),
-                DateNormalizer.normalize(issue_date),
-                InvoiceNumberNormalizer.normalize(original_invoice_number),
-                AmountNormalizer.normalize(gross_amount),
-            ]),
-            raw_fields={
-                'seller_nip': seller_nip,
-                'correction_number': correction_number,
-                'issue_date': issue_date,
-                'original_invoice_number': original_invoice_number,
-                'gross_amount': gross_amount,
-            }
+            canonical_string=(
+                f"{NIPValidator.normalize(seller_nip)}"
+                f"|{InvoiceNumberNormalizer.normalize(correction_number)}"
+                f"|{DateNormalizer.normalize(issue_date)}"
+                f"|{InvoiceNumberNormalizer.normalize(original_invoice_number)}"
+                f"|{AmountNormalizer.normalize(gross_amount)}"
+            )
         )
         return self._generate_id(canonical)
 
@@ -424,19 +556,12 @@ class DocumentIDGenerator:
             parts.append(NIPValidator.normalize(issuer_nip))
         if payer_name:
             # Hash nazwy płatnika dla prywatności
-            name_hash = hashlib.md5(payer_name.strip().upper().encode()).hexdigest()[:8]
+            name_hash = self._name_hash(payer_name.strip().upper().encode())
             parts.append(name_hash)
 
         canonical = CanonicalData(
             document_type=DocumentType.CASH_IN,
-            canonical_string="|".join(parts),
-            raw_fields={
-                'document_number': document_number,
-                'document_date': document_date,
-                'amount': amount,
-                'issuer_nip': issuer_nip,
-                'payer_name': payer_name,
-            }
+            canonical_string="|".join(parts)
         )
         return self._generate_id(canonical)
 
@@ -462,19 +587,12 @@ class DocumentIDGenerator:
         if issuer_nip:
             parts.append(NIPValidator.normalize(issuer_nip))
         if recipient_name:
-            name_hash = hashlib.md5(recipient_name.strip().upper().encode()).hexdigest()[:8]
+            name_hash = self._name_hash(recipient_name.strip().upper().encode())
             parts.append(name_hash)
 
         canonical = CanonicalData(
             document_type=DocumentType.CASH_OUT,
-            canonical_string="|".join(parts),
-            raw_fields={
-                'document_number': document_number,
-                'document_date': document_date,
-                'amount': amount,
-                'issuer_nip': issuer_nip,
-                'recipient_name': recipient_name,
-            }
+            canonical_string="|".join(parts)
         )
         return self._generate_id(canonical)
 
@@ -493,18 +611,12 @@ class DocumentIDGenerator:
         """
         canonical = CanonicalData(
             document_type=DocumentType.BILL,
-            canonical_string="|".join([
-                NIPValidator.normalize(issuer_nip),
-                InvoiceNumberNormalizer.normalize(bill_number),
-                DateNormalizer.normalize(issue_date),
-                AmountNormalizer.normalize(gross_amount),
-            ]),
-            raw_fields={
-                'issuer_nip': issuer_nip,
-                'bill_number': bill_number,
-                'issue_date': issue_date,
-                'gross_amount': gross_amount,
-            }
+            canonical_string=(
+                f"{NIPValidator.normalize(issuer_nip)}"
+                f"|{InvoiceNumberNormalizer.normalize(bill_number)}"
+                f"|{DateNormalizer.normalize(issue_date)}"
+                f"|{AmountNormalizer.normalize(gross_amount)}"
+            )
         )
         return self._generate_id(canonical)
 
@@ -533,14 +645,7 @@ class DocumentIDGenerator:
 
         canonical = CanonicalData(
             document_type=DocumentType.DEBIT_NOTE,
-            canonical_string="|".join(parts),
-            raw_fields={
-                'issuer_nip': issuer_nip,
-                'note_number': note_number,
-                'issue_date': issue_date,
-                'amount': amount,
-                'recipient_nip': recipient_nip,
-            }
+            canonical_string="|".join(parts)
         )
         return self._generate_id(canonical)
 
@@ -567,13 +672,7 @@ class DocumentIDGenerator:
 
         canonical = CanonicalData(
             document_type=DocumentType.DELIVERY_NOTE,
-            canonical_string="|".join(parts),
-            raw_fields={
-                'issuer_nip': issuer_nip,
-                'document_number': document_number,
-                'issue_date': issue_date,
-                'recipient_nip': recipient_nip,
-            }
+            canonical_string="|".join(parts)
         )
         return self._generate_id(canonical)
 
@@ -603,14 +702,7 @@ class DocumentIDGenerator:
 
         canonical = CanonicalData(
             document_type=DocumentType.EXPENSE_REPORT,
-            canonical_string="|".join(parts),
-            raw_fields={
-                'employee_id': employee_id,
-                'report_date': report_date,
-                'total_amount': total_amount,
-                'report_number': report_number,
-                'company_nip': company_nip,
-            }
+            canonical_string="|".join(parts)
         )
         return self._generate_id(canonical)
 
@@ -635,12 +727,7 @@ class DocumentIDGenerator:
 
         canonical = CanonicalData(
             document_type=document_type,
-            canonical_string="|".join(parts),
-            raw_fields={
-                'content_hash': content_hash,
-                'document_date': document_date,
-                'issuer_nip': issuer_nip,
-            }
+            canonical_string="|".join(parts)
         )
         return self._generate_id(canonical)
 
@@ -651,11 +738,26 @@ class DocumentIDGenerator:
         Format: {PREFIX}-{TYPE}-{HASH16}
         Przykład: DOC-FV-A7B3C9D2E1F04856
         """
-        # SHA256 z canonical string
-        hash_bytes = hashlib.sha256(canonical.canonical_string.encode('utf-8')).digest()
-        hash_hex = hash_bytes.hex()[:16].upper()
+        # Skrót (domyślnie SHA256) z canonical string
+        hash_hex = self._digest(canonical.canonical_string.encode()).hex().upper()
+
+        return self._id_heads[canonical.document_type] + hash_hex
+
+    def generate_batch(self, canonicals: Iterable[CanonicalData]) -> List[str]:
+        """
+        Generuje identyfikatory dla wielu dokumentów naraz.
 
-        return f"{self.prefix}-{canonical.document_type.value}-{hash_hex}"
+        Wynik jest identyczny z _generate_id dla każdego elementu; pętla
+        korzysta z lokalnych referencji, co przy dużych partiach ogranicza
+        narzut wywołań w Pythonie. Hashowanie krótkich ciągów kanonicznych
+        nie zwalnia GIL, więc wątki nic tu nie dają.
+        """
+        digest = self._digest
+        heads = self._id_heads
+        return [
+            heads[c.document_type] + digest(c.canonical_string.encode()).hex().upper()
+            for c in canonicals
+        ]
 
     def verify_id(self, document_id: str, canonical_string: str) -> bool:
         """
@@ -665,14 +767,15 @@ class DocumentIDGenerator:
         >>> gen.verify_id("DOC-FV-A7B3C9D2E1F04856", "5213017228|FV/2025/00142|2025-01-15|1230.00")
         True
         """
-        hash_bytes = hashlib.sha256(canonical_string.encode('utf-8')).digest()
-        expected_hash = hash_bytes.hex()[:16].upper()
-
+        # Najpierw struktura ID - niepoprawne odrzucamy bez hashowania
         parts = document_id.split('-')
-        if len(parts) != 3:
+        if len(parts) != 3 or len(parts[2]) != 16:
             return False
 
-        return parts[2] == expected_hash
+        expected_hash = self._digest(canonical_string.encode()).hex().upper()
+        # Porównanie w stałym czasie (bajty - compare_digest nie przyjmuje
+        # str spoza ASCII)
+        return hmac.compare_digest(parts[2].encode(), expected_hash.encode())
 
     @staticmethod
     def parse_id(document_id: str) -> dict:
@@ -690,11 +793,7 @@ class DocumentIDGenerator:
         prefix, type_code, hash_value = parts
 
         # Znajdź typ dokumentu
-        doc_type = None
-        for dt in DocumentType:
-            if dt.value == type_code:
-                doc_type = dt
-                break
+        doc_type = _TYPE_BY_CODE.get(type_code)
 
         return {
             'prefix': prefix,
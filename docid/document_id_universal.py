@@ -4,10 +4,14 @@ Universal Document ID Generator for any document type including images, graphics
 
 import hashlib
 import json
+import logging
+import mmap
 from pathlib import Path
-from typing import Dict, Any, Optional, Union
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, List, Optional, Union
+from dataclasses import dataclass, replace
 from enum import Enum
+from functools import lru_cache
 import os
 import time
 
@@ -29,6 +33,76 @@ try:
 except ImportError:
     NUMPY_AVAILABLE = False
 
+# xxhash (optional, docid[fast]) - only used when hash_algo='xxh3' is requested
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+logger = logging.getLogger(__name__)
+
+
+def _file_hexdigest(file_path: Union[str, Path], new_hash: Any = hashlib.sha256,
+                    chunk_size: int = 1 << 20) -> str:
+    """
+    Hex digest of a file without reading it into Python bytes.
+    
+    The file is memory-mapped and hashed straight from the page cache; where
+    mmap is not possible (empty files, special files) it is read in chunks.
+    """
+    with open(file_path, 'rb', buffering=0) as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return new_hash(mm).hexdigest()
+        except (OSError, ValueError):
+            pass
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+            return hashlib.file_digest(f, new_hash).hexdigest()
+        digest = new_hash()
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+def _rgb_histogram(img: Any) -> Optional[List[int]]:
+    """
+    img.convert('RGB').histogram() for 'L' and 'P' images, computed from the
+    native pixels. Returns None for other modes (the caller converts).
+    """
+    if img.mode == 'L':
+        # L -> RGB copies the value into all three channels
+        return img.histogram() * 3
+    if img.mode != 'P':
+        return None
+    counts = img.histogram()
+    palette = img.getpalette() or []
+    if any(counts[len(palette) // 3:]):
+        return None  # index outside a short palette - let Pillow decide
+    histogram = [0] * 768
+    for index, count in enumerate(counts):
+        if count:
+            r, g, b = palette[3 * index:3 * index + 3]
+            histogram[r] += count
+            histogram[256 + g] += count
+            histogram[512 + b] += count
+    return histogram
+
+
+# 64-bit feature fingerprints (16 hex chars). SHA-256 truncation is the
+# historical scheme; xxh3 is much faster but yields different universal IDs.
+def _sha256_fingerprint(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def _xxh3_fingerprint(data: bytes) -> str:
+    return xxhash.xxh3_64_hexdigest(data)
+
+
+_FINGERPRINTS = {
+    'sha256': _sha256_fingerprint,
+    'xxh3': _xxh3_fingerprint,
+}
+
 class DocumentType(Enum):
     """Universal document types"""
     PDF = "PDF"
@@ -53,11 +127,86 @@ class UniversalDocumentFeatures:
     creation_time: Optional[float] = None
     modification_time: Optional[float] = None
 
+class _FileVersion:
+    """stat() result of a file, compared by the fields that identify its version"""
+    
+    __slots__ = ('stat', '_key')
+    
+    def __init__(self, stat: os.stat_result):
+        self.stat = stat
+        self._key = (stat.st_ino, stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns)
+    
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, _FileVersion) and self._key == other._key
+    
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+
+# Feature extractor (method name, so subclasses can override) per extension;
+# anything else goes to extract_generic_features
+_EXTRACTORS = {
+    '.pdf': 'extract_pdf_features',
+    '.jpg': 'extract_image_features',
+    '.jpeg': 'extract_image_features',
+    '.png': 'extract_image_features',
+    '.gif': 'extract_image_features',
+    '.bmp': 'extract_image_features',
+    '.tiff': 'extract_image_features',
+    '.webp': 'extract_image_features',
+}
+
+# Document type code in the ID; other file types use the first three
+# characters of their extension
+_TYPE_CODES = {
+    'PDF': 'PDF',
+    'IMAGE': 'IMG',
+    'JPG': 'IMG',
+    'JPEG': 'IMG',
+    'PNG': 'IMG',
+    'GIF': 'IMG',
+    'BMP': 'IMG',
+    'TIFF': 'IMG',
+    'WEBP': 'IMG',
+}
+
+
 class UniversalDocumentIDGenerator:
-    """Universal document ID generator for any document format"""
+    """
+    Universal document ID generator for any document format.
     
-    def __init__(self, prefix: str = "UNIV"):
+    Instances are thread-safe: configuration is fixed at construction and the
+    feature cache is an lru_cache, so one generator can serve a thread pool.
+    """
+    
+    def __init__(self, prefix: str = "UNIV", hash_algo: str = "sha256"):
+        """
+        Args:
+            prefix: ID prefix (default UNIV)
+            hash_algo: Hash for the per-feature fingerprints - 'sha256'
+                (default, existing IDs) or 'xxh3' (faster, needs xxhash,
+                gives different IDs). The final ID hash is always SHA-256.
+        """
+        if hash_algo not in _FINGERPRINTS:
+            raise ValueError(f"Unsupported hash algorithm: {hash_algo}")
+        if hash_algo == 'xxh3' and xxhash is None:
+            raise ImportError("xxhash is required for hash_algo='xxh3'")
         self.prefix = prefix
+        self.hash_algo = hash_algo
+        self._fingerprint = _FINGERPRINTS[hash_algo]
+        # Streaming counterpart of _fingerprint (hexdigest()[:16] gives the same value)
+        self._new_hash = xxhash.xxh3_64 if hash_algo == 'xxh3' else hashlib.sha256
+        self._cached_features = lru_cache(maxsize=1024)(self._extract_features)
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # The lru_cache wrapper cannot be pickled; workers start with an empty cache
+        state = self.__dict__.copy()
+        del state['_cached_features']
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._cached_features = lru_cache(maxsize=1024)(self._extract_features)
     
     def _calculate_visual_hash(self, img: Any) -> Optional[str]:
         """
@@ -74,28 +223,35 @@ class UniversalDocumentIDGenerator:
                 img = img.convert('L')
             
             # 2. Pad to square to handle different aspect ratios consistently
+            # (a square image would come back unchanged, so skip the copies)
             width, height = img.size
-            max_side = max(width, height)
-            img = ImageOps.pad(img, (max_side, max_side), color=255) # White padding for grayscale
+            if width != height:
+                max_side = max(width, height)
+                img = ImageOps.pad(img, (max_side, max_side), color=255) # White padding for grayscale
             
             # 3. Resize to small fixed size (32x32)
             img_small = img.resize((32, 32), Image.Resampling.LANCZOS)
             
-            # 4. Get pixel data and calculate average
-            pixels = list(img_small.getdata())
-            avg = sum(pixels) / len(pixels)
-            
-            # 5. Generate bit string
-            bits = "".join(['1' if p >= avg else '0' for p in pixels])
-            
-            # 6. Convert bits to hex
-            hex_hash = hex(int(bits, 2))[2:].zfill(len(bits)//4)
-            return hashlib.sha256(hex_hash.encode()).hexdigest()[:16]
+            # 4-6. Threshold pixels against their average, pack bits to hex
+            if NUMPY_AVAILABLE:
+                # Vectorized: packbits (MSB first) + bytes.hex(); the loop
+                # below packs the same bytes without numpy
+                pixels = np.asarray(img_small, dtype=np.uint8)
+                bits = pixels >= pixels.sum() / pixels.size
+                hex_hash = np.packbits(bits).tobytes().hex()
+            else:
+                pixels = img_small.tobytes()
+                avg = sum(pixels) / len(pixels)
+                # Threshold all pixels in C via a 256-entry b'0'/b'1' table
+                bits = pixels.translate(bytes(49 if v >= avg else 48 for v in range(256)))
+                hex_hash = int(bits, 2).to_bytes(len(bits) // 8, 'big').hex()
+            return self._fingerprint(hex_hash.encode())
         except Exception as e:
-            logger.debug(f"Visual hash calculation failed: {e}")
+            logger.debug("Visual hash calculation failed: %s", e)
             return None
 
-    def extract_pdf_features(self, file_path: Union[str, Path]) -> UniversalDocumentFeatures:
+    def extract_pdf_features(self, file_path: Union[str, Path],
+                             stat_result: Optional[os.stat_result] = None) -> UniversalDocumentFeatures:
         """Extract features from PDF documents"""
         if not PYMUPDF_AVAILABLE:
             raise ImportError("PyMuPDF (fitz) is required for PDF processing")
@@ -104,21 +260,27 @@ class UniversalDocumentIDGenerator:
         
         try:
             # Basic file info
-            stat = Path(file_path).stat()
+            stat = stat_result or Path(file_path).stat()
             file_size = stat.st_size
             creation_time = stat.st_ctime
             modification_time = stat.st_mtime
             
             # Content features
             content_features = []
-            text_content = ""
+            # Text is streamed into its hash page by page, never concatenated
+            text_digest = self._new_hash()
+            has_text = False
             
-            for page_num in range(len(doc)):
-                page = doc[page_num]
+            first_page = None
+            for page_num, page in enumerate(doc):
+                if first_page is None:
+                    first_page = page
                 
                 # Extract text
                 page_text = page.get_text()
-                text_content += page_text
+                if page_text:
+                    text_digest.update(page_text.encode())
+                    has_text = True
                 content_features.append(f"page_{page_num}_text_length:{len(page_text)}")
                 
                 # Extract images info
@@ -129,8 +291,9 @@ class UniversalDocumentIDGenerator:
                 rect = page.rect
                 content_features.append(f"page_{page_num}_size:{rect.width:.2f}x{rect.height:.2f}")
                 
-                # Extract drawings/vectors
-                drawings = page.get_drawings()
+                # Extract drawings/vectors (only counted - get_cdrawings skips
+                # get_drawings' per-item conversion to Rect/Point objects)
+                drawings = page.get_cdrawings()
                 content_features.append(f"page_{page_num}_drawings:{len(drawings)}")
                 
                 # Extract font information
@@ -142,14 +305,13 @@ class UniversalDocumentIDGenerator:
             metadata_str = json.dumps(metadata, sort_keys=True)
             
             # Calculate hashes
-            content_hash = hashlib.sha256('\n'.join(content_features).encode()).hexdigest()[:16]
-            text_hash = hashlib.sha256(text_content.encode()).hexdigest()[:16] if text_content else None
-            metadata_hash = hashlib.sha256(metadata_str.encode()).hexdigest()[:16]
+            content_hash = self._fingerprint('\n'.join(content_features).encode())
+            text_hash = text_digest.hexdigest()[:16] if has_text else None
+            metadata_hash = self._fingerprint(metadata_str.encode())
             
             # Visual hash (first page rendered as image)
             visual_hash = None
             try:
-                first_page = doc[0]
                 # Render at fixed resolution (e.g. 72 DPI)
                 pix = first_page.get_pixmap(matrix=fitz.Matrix(1.0, 1.0))
                 img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
@@ -164,7 +326,7 @@ class UniversalDocumentIDGenerator:
                 text_hash=text_hash,
                 metadata_hash=metadata_hash,
                 visual_hash=visual_hash,
-                dimensions=(doc[0].rect.width, doc[0].rect.height) if len(doc) > 0 else None,
+                dimensions=(first_page.rect.width, first_page.rect.height) if first_page is not None else None,
                 page_count=len(doc),
                 creation_time=creation_time,
                 modification_time=modification_time
@@ -173,31 +335,36 @@ class UniversalDocumentIDGenerator:
         finally:
             doc.close()
     
-    def extract_image_features(self, file_path: Union[str, Path]) -> UniversalDocumentFeatures:
+    def extract_image_features(self, file_path: Union[str, Path],
+                               stat_result: Optional[os.stat_result] = None) -> UniversalDocumentFeatures:
         """Extract features from image files"""
         if not PIL_AVAILABLE:
             raise ImportError("PIL (Pillow) is required for image processing")
         
         with Image.open(file_path) as img:
-            stat = Path(file_path).stat()
+            stat = stat_result or Path(file_path).stat()
             file_size = stat.st_size
             creation_time = stat.st_ctime
             modification_time = stat.st_mtime
             
-            # Convert to RGB for consistent processing
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
+            # Features describe the image as RGB. Grayscale and palette images
+            # yield the same RGB histogram and grayscale pixels without the
+            # full-size RGB expansion; other modes are converted.
+            histogram = _rgb_histogram(img)
+            if histogram is None:
+                if img.mode != 'RGB':
+                    img = img.convert('RGB')
+                histogram = img.histogram()
             
             # Basic features
             dimensions = img.size
-            mode = img.mode
+            mode = 'RGB'
             
             # Visual hash
             visual_hash = self._calculate_visual_hash(img)
             
             # Color histogram hash
-            histogram = img.histogram()
-            color_hash = hashlib.sha256(str(histogram).encode()).hexdigest()[:16]
+            color_hash = self._fingerprint(str(histogram).encode())
             
             # Content hash based on multiple features
             content_features = [
@@ -207,7 +374,7 @@ class UniversalDocumentIDGenerator:
                 f"color_hash:{color_hash}",
                 f"file_size:{file_size}"
             ]
-            content_hash = hashlib.sha256('\n'.join(content_features).encode()).hexdigest()[:16]
+            content_hash = self._fingerprint('\n'.join(content_features).encode())
             
             return UniversalDocumentFeatures(
                 file_type="IMAGE",
@@ -220,19 +387,19 @@ class UniversalDocumentIDGenerator:
                 modification_time=modification_time
             )
     
-    def extract_generic_features(self, file_path: Union[str, Path]) -> UniversalDocumentFeatures:
+    def extract_generic_features(self, file_path: Union[str, Path],
+                                 stat_result: Optional[os.stat_result] = None) -> UniversalDocumentFeatures:
         """Extract basic features from any file type"""
-        stat = Path(file_path).stat()
+        stat = stat_result or Path(file_path).stat()
         file_size = stat.st_size
         creation_time = stat.st_ctime
         modification_time = stat.st_mtime
         
         # Basic file content hash
         try:
-            with open(file_path, 'rb') as f:
-                content_hash = hashlib.sha256(f.read()).hexdigest()[:16]
+            content_hash = _file_hexdigest(file_path, self._new_hash)[:16]
         except:
-            content_hash = hashlib.sha256(str(file_size).encode()).hexdigest()[:16]
+            content_hash = self._fingerprint(str(file_size).encode())
         
         # File extension
         file_ext = Path(file_path).suffix.lower()
@@ -246,25 +413,69 @@ class UniversalDocumentIDGenerator:
         )
     
     def get_document_features(self, file_path: Union[str, Path]) -> UniversalDocumentFeatures:
-        """Extract features based on file type"""
-        file_path = Path(file_path)
+        """
+        Extract features based on file type.
         
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
+        Results are cached per file version (inode, size, mtime, ctime), so
+        generate-then-verify or compare on the same file extracts only once.
+        The caller gets a copy, so changing it does not affect later IDs.
+        """
+        return replace(self._features(file_path))
+    
+    def _features(self, file_path: Union[str, Path]) -> UniversalDocumentFeatures:
+        """Cached features of the current file version (shared - do not modify)"""
+        file_path = Path(file_path)
         
-        file_ext = file_path.suffix.lower()
+        try:
+            st = file_path.stat()
+        except OSError:
+            raise FileNotFoundError(f"File not found: {file_path}") from None
         
-        if file_ext == '.pdf':
-            return self.extract_pdf_features(file_path)
-        elif file_ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp']:
-            return self.extract_image_features(file_path)
-        else:
-            return self.extract_generic_features(file_path)
+        return self._cached_features(file_path, _FileVersion(st))
+    
+    def _extract_features(self, file_path: Path, version: _FileVersion) -> UniversalDocumentFeatures:
+        """Uncached feature extraction, reusing the stat() done by the caller"""
+        extractor = _EXTRACTORS.get(file_path.suffix.lower(), 'extract_generic_features')
+        return getattr(self, extractor)(file_path, stat_result=version.stat)
     
     def generate_universal_id(self, file_path: Union[str, Path]) -> str:
         """Generate universal document ID"""
-        features = self.get_document_features(file_path)
+        return self._id_from_features(self._features(file_path))
+    
+    def generate_universal_ids(self, file_paths: Iterable[Union[str, Path]],
+                               max_workers: Optional[int] = None,
+                               return_exceptions: bool = False) -> List[Union[str, Exception]]:
+        """
+        Generate universal document IDs for many files, in input order.
         
+        Feature extraction (file reads, streamed hashing, image decoding) releases
+        the GIL, so files are processed on a thread pool. PDFs stay on the calling
+        thread because PyMuPDF is not thread-safe. The final per-ID hashes are over
+        short canonical strings and are computed serially.
+        
+        The first failing file raises, unless return_exceptions is True - then
+        its exception takes the place of its ID and the other files still get IDs.
+        """
+        paths = [Path(p) for p in file_paths]
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [
+                None if path.suffix.lower() == '.pdf' else pool.submit(self._features, path)
+                for path in paths
+            ]
+            results = []
+            for path, future in zip(paths, futures):
+                try:
+                    features = self._features(path) if future is None else future.result()
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    results.append(e)
+                else:
+                    results.append(self._id_from_features(features))
+        return results
+    
+    def _id_from_features(self, features: UniversalDocumentFeatures) -> str:
+        """Build the universal ID from extracted features"""
         # Create canonical data string
         canonical_data = [
             features.file_type,
@@ -287,19 +498,7 @@ class UniversalDocumentIDGenerator:
         hash_value = hashlib.sha256(canonical_string.encode()).hexdigest()[:16].upper()
         
         # Determine document type code
-        type_codes = {
-            'PDF': 'PDF',
-            'IMAGE': 'IMG',
-            'JPG': 'IMG',
-            'JPEG': 'IMG',
-            'PNG': 'IMG',
-            'GIF': 'IMG',
-            'BMP': 'IMG',
-            'TIFF': 'IMG',
-            'WEBP': 'IMG',
-        }
-        
-        type_code = type_codes.get(features.file_type, features.file_type[:3].upper())
+        type_code = _TYPE_CODES.get(features.file_type) or features.file_type[:3].upper()
         
         return f"{self.prefix}-{type_code}-{hash_value}"
     
@@ -328,11 +527,18 @@ class UniversalDocumentIDGenerator:
     
     def compare_documents(self, file_path1: Union[str, Path], file_path2: Union[str, Path]) -> Dict[str, Any]:
         """Compare two documents"""
-        features1 = self.get_document_features(file_path1)
-        features2 = self.get_document_features(file_path2)
+        features1 = self._features(file_path1)
+        # The same inode (also via a link) needs no second extraction, as long
+        # as the extension - which picks the extractor - matches too
+        try:
+            same_file = (Path(file_path1).suffix.lower() == Path(file_path2).suffix.lower()
+                         and os.path.samefile(file_path1, file_path2))
+        except OSError:
+            same_file = False
+        features2 = features1 if same_file else self._features(file_path2)
         
-        id1 = self.generate_universal_id(file_path1)
-        id2 = self.generate_universal_id(file_path2)
+        id1 = self._id_from_features(features1)
+        id2 = id1 if same_file else self._id_from_features(features2)
         
         comparison = {
             'identical_ids': id1 == id2,
@@ -353,18 +559,24 @@ class UniversalDocumentIDGenerator:
         
         return comparison
 
-# Convenience functions
+# Convenience functions share one generator so its feature cache is reused
+_DEFAULT_GEN = UniversalDocumentIDGenerator()
+
 def generate_universal_document_id(file_path: Union[str, Path]) -> str:
     """Generate universal document ID"""
-    generator = UniversalDocumentIDGenerator()
-    return generator.generate_universal_id(file_path)
+    return _DEFAULT_GEN.generate_universal_id(file_path)
+
+def generate_universal_document_ids(file_paths: Iterable[Union[str, Path]],
+                                    max_workers: Optional[int] = None,
+                                    return_exceptions: bool = False) -> List[Union[str, Exception]]:
+    """Generate universal document IDs for many files in parallel, in input order"""
+    return _DEFAULT_GEN.generate_universal_ids(file_paths, max_workers=max_workers,
+                                               return_exceptions=return_exceptions)
 
 def verify_universal_document_id(file_path: Union[str, Path], document_id: str) -> bool:
     """Verify universal document ID"""
-    generator = UniversalDocumentIDGenerator()
-    return generator.verify_universal_id(file_path, document_id)
+    return _DEFAULT_GEN.verify_universal_id(file_path, document_id)
 
 def compare_universal_documents(file_path1: Union[str, Path], file_path2: Union[str, Path]) -> Dict[str, Any]:
     """Compare two universal documents"""
-    generator = UniversalDocumentIDGenerator()
-    return generator.compare_documents(file_path1, file_path2)
+    return _DEFAULT_GEN.compare_documents(file_path1, file_path2)
@@ -10,12 +10,237 @@ import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from ..document_id import _SLOTS
 from ..ocr_processor import DocumentOCRResult
 
 logger = logging.getLogger(__name__)
 
+# Wzorce ekstraktorów - kompilowane raz przy imporcie modułu, a nie przy
+# każdym wywołaniu (cache modułu re jest ograniczony i wymaga hashowania
+# wzorca przy każdym re.search)
+_AMOUNT_STRIP = re.compile(r'[^\d,\.]')
+_NIP_SEPARATORS = re.compile(r'[\s\-]')
+
+# Formaty dat - od najdłuższych, z granicami słów
+_DATE_FORMATS = (
+    (re.compile(r'\b(\d{4})[/\-\.](\d{2})[/\-\.](\d{2})\b'), lambda m: f'{m.group(1)}-{m.group(2)}-{m.group(3)}'),  # YYYY-MM-DD
+    (re.compile(r'\b(\d{2})[/\-\.](\d{2})[/\-\.](\d{4})\b'), lambda m: f'{m.group(3)}-{m.group(2)}-{m.group(1)}'),  # DD-MM-YYYY
+    (re.compile(r'\b(\d{2})[/\-\.](\d{2})[/\-\.](\d{2})\b'), lambda m: f'20{m.group(3)}-{m.group(2)}-{m.group(1)}'),  # DD-MM-YY
+)
+
+# re.IGNORECASE porównuje wielkość liter znak po znaku i wyłącza szybkie
+# wyszukiwanie literalnych fragmentów wzorca, więc skan długiego tekstu OCR
+# jest kilkanaście razy wolniejszy. Wzorce bez rozróżniania wielkości liter
+# (_CaselessPattern, pisane małymi literami) dopasowujemy bez flagi do
+# text.lower() - raz na dokument - a grupy wycinamy z oryginalnego tekstu.
+# İ, ı i ſ dopasowują się pod IGNORECASE inaczej niż po lower() (İ zmienia
+# też długość tekstu), więc dla takich tekstów zostaje zwykłe IGNORECASE.
+_CASE_UNSAFE = re.compile('[İıſ]')
+
+
+# Ten sam tekst jest zamieniany na małe litery w can_extract każdego
+# ekstraktora i ponownie w extract wybranego; kopia jest zapamiętywana dla
+# kilku ostatnich dokumentów (klucz to napis, jego hash Python trzyma w obiekcie)
+@lru_cache(maxsize=8)
+def _lower_text(text: str) -> str:
+    """text.lower() zapamiętane dla ostatnio przetwarzanych tekstów."""
+    return text.lower()
+
+
+def _lower(text: str) -> Optional[str]:
+    """text.lower() z zachowanymi pozycjami znaków albo None (patrz wyżej)."""
+    if _CASE_UNSAFE.search(text):
+        return None
+    return _lower_text(text)
+
+
+class _CaselessPattern:
+    """Wzorzec dopasowywany bez rozróżniania wielkości liter."""
+
+    __slots__ = ('lower', 'ignorecase')
+
+    def __init__(self, source: str, flags: int = 0):
+        self.lower = re.compile(source, flags)
+        self.ignorecase = re.compile(source, flags | re.IGNORECASE)
+
+    def search(self, text: str, text_lower: Optional[str] = None, pos: int = 0) -> Optional['re.Match']:
+        """
+        Pierwsze dopasowanie od pozycji pos.
+
+        text_lower to wynik _lower(text); None oznacza dopasowanie z IGNORECASE.
+        Pozycje dopasowania odnoszą się do obu napisów, ale grupy trzeba
+        wycinać z text, żeby zachować oryginalną wielkość liter.
+        """
+        if text_lower is None:
+            return self.ignorecase.search(text, pos)
+        return self.lower.search(text_lower, pos)
+
+    def search_group(self, text: str, text_lower: Optional[str] = None) -> Optional[str]:
+        """Pierwsza grupa pierwszego dopasowania, z oryginalną wielkością liter."""
+        match = self.search(text, text_lower)
+        return text[match.start(1):match.end(1)] if match else None
+
+
+# Faktura - numer wymaga przynajmniej jednej cyfry, a słowa kluczowe nie
+# zjadają prefiksów; numer po "faktura ..." ma pierwszeństwo przed numerem
+# po "nr ...", potem wzorce XML (z rozróżnianiem wielkości liter)
+_INVOICE_NUMBER_AFTER_KEYWORD = (
+    r'\b(?:faktura|fv|rachunek|dokumentu)\b\s*(?:vat)?\s*(?:nr|numer)?[:\s]+([a-z0-9\/\-]*\d+[a-z0-9\/\-]*)'
+)
+_INVOICE_NUMBER_AFTER_NR = (
+    r'\b(?:nr|numer)\b\s*(?:faktury|fv|dokumentu)?[:\s]+([a-z0-9\/\-]*\d+[a-z0-9\/\-]*)'
+)
+_INVOICE_NUMBER_PATTERN = _CaselessPattern(_INVOICE_NUMBER_AFTER_KEYWORD)
+# Oba warianty w jednym przebiegu - zamiast dwóch pełnych skanów tekstu
+_INVOICE_NUMBER_EITHER_PATTERN = _CaselessPattern(_INVOICE_NUMBER_AFTER_KEYWORD + '|' + _INVOICE_NUMBER_AFTER_NR)
+_XML_INVOICE_NUMBER_PATTERNS = tuple(re.compile(p) for p in (
+    r'<InvoiceNumber>([^<]+)</InvoiceNumber>',
+    r'<invoice_number>([^<]+)</invoice_number>',
+    r'<FakturaNumer>([^<]+)</FakturaNumer>',
+))
+
+# Data wystawienia - wspiera YYYY-MM-DD i DD-MM-YYYY
+_ISSUE_DATE_PATTERNS = tuple(_CaselessPattern(p) for p in (
+    r'data\s*wystawienia[:\s]*(\d{2,4}[.\-/]\d{2}[.\-/]\d{2,4})',
+    r'wystawion[ao]\s*(?:dnia)?[:\s]*(\d{2,4}[.\-/]\d{2}[.\-/]\d{2,4})',
+    r'data[:\s]*(\d{2,4}[.\-/]\d{2}[.\-/]\d{2,4})',
+))
+_XML_ISSUE_DATE_PATTERNS = tuple(re.compile(p) for p in (
+    r'<IssueDate>([^<]+)</IssueDate>',
+    r'<issue_date>([^<]+)</issue_date>',
+    r'<DataWystawienia>([^<]+)</DataWystawienia>',
+    r'<DataWystaw>([^<]+)</DataWystaw>',
+))
+
+_GROSS_PATTERN = _CaselessPattern(r'brutto[:\s]*(\d[\d\s,\.]*\d)')
+_NET_PATTERN = _CaselessPattern(r'netto[:\s]*(\d[\d\s,\.]*\d)')
+_VAT_PATTERN = _CaselessPattern(r'(?:vat|podatek)[:\s]*(\d[\d\s,\.]*\d)')
+_XML_GROSS_PATTERN = re.compile(r'<TotalGrossAmount>([^<]+)</TotalGrossAmount>')
+_XML_NET_PATTERN = re.compile(r'<TotalNetAmount>([^<]+)</TotalNetAmount>')
+_XML_VAT_PATTERN = re.compile(r'<TotalVATAmount>([^<]+)</TotalVATAmount>')
+
+# Paragon - wykrywanie (na tekście już zamienionym na małe litery)
+_PERCENT_PATTERN = re.compile(r'\d+%')
+_XML_RECEIPT_STRUCTURE = re.compile(r'<receipt[^>]*>.*?</receipt>', re.DOTALL)
+_XML_RECEIPT_ELEMENTS = re.compile(r'<receiptnumber|<cashregister|<fiscal')
+
+_TOTAL_AMOUNT_PATTERNS = tuple(_CaselessPattern(p) for p in (
+    # Main SUMA (not PTU or VAT) - highest priority
+    r'suma(?!\s+ptu)(?!\s+vat)[:\s]*(\d[\d\s,\.]*\d)',
+    r'razem[:\s]*(\d[\d\s,\.]*\d)',
+    r'do zapłaty[:\s]*(\d[\d\s,\.]*\d)',
+    # XML patterns
+    r'<totalgrossamount>([^<]+)</totalgrossamount>',
+    # HTML patterns - handle tags that separate label from value
+    r'<span>suma:</span>\s*<span>(\d[\d\s,\.]*\d)</span>',
+    # Flexible pattern for main SUMA only
+    r'suma(?!\s+ptu)(?!\s+vat)[^0-9]*?(\d[\d\s,\.]*\d)',
+))
+
+# Kwoty płatności (gotówka, karta) - szablony, w które wstawiana jest
+# sprawdzana kwota, więc nie da się ich skompilować z góry
+_PAYMENT_PATTERNS = (
+    r'gotówka[:\s]*(\d[\d\s,\.]*\d)',
+    r'karta[:\s]*(\d[\d\s,\.]*\d)',
+    r'płatność[:\s]*(\d[\d\s,\.]*\d)',
+    r'<span>gotówka:</span>\s*<span>(\d[\d\s,\.]*\d)</span>',
+)
+
+_RECEIPT_NUMBER_PATTERN = _CaselessPattern(r'(?:nr|numer)\s*(?:paragonu)?[:\s]*([a-z0-9\/\-]+)')
+_CASH_REGISTER_PATTERN = _CaselessPattern(r'(?:kasa|stanowisko)[:\s]*(\d+)')
+_XML_RECEIPT_NUMBER_PATTERN = re.compile(r'<ReceiptNumber>([^<]+)</ReceiptNumber>')
+_XML_CASH_REGISTER_PATTERN = re.compile(r'<CashRegisterNumber>([^<]+)</CashRegisterNumber>')
+
+# Umowa
+_CONTRACT_DATE_PATTERNS = tuple(_CaselessPattern(p) for p in (
+    r'zawarta\s*(?:w\s*dniu)?[:\s]*(\d{2}[.\-/]\d{2}[.\-/]\d{4})',
+    r'dnia[:\s]*(\d{2}[.\-/]\d{2}[.\-/]\d{4})',
+    r'data[:\s]*(\d{2}[.\-/]\d{2}[.\-/]\d{4})',
+))
+
+_CONTRACT_NUMBER_PATTERNS = tuple(_CaselessPattern(p) for p in (
+    r'umowa\s*(?:nr|numer)?[:\s]*([a-z0-9\/\-]+)',
+    r'(?:nr|numer)\s*(?:umowy)?[:\s]*([a-z0-9\/\-]+)',
+))
+
+# Rodzaj umowy - pierwsze słowo z listy obecne w tekście (kolejność listy,
+# nie pozycja w tekście, decyduje o wyniku)
+_CONTRACT_TYPES = (
+    ('zlecenie', 'ZLECENIE'),
+    ('o dzieło', 'DZIELO'),
+    ('najmu', 'NAJEM'),
+    ('sprzedaży', 'SPRZEDAZ'),
+    ('współpracy', 'WSPOLPRACA'),
+    ('o pracę', 'PRACA'),
+)
+
+# Normalizacja - te same kwoty, NIP-y i daty wracają wielokrotnie (trafienia
+# regexów i listy detected_*, kolejne ekstraktory w extract_all), a wynik
+# zależy tylko od napisu, więc jest zapamiętywany
+@lru_cache(maxsize=4096)
+def _normalize_amount(amount: str) -> str:
+    """Normalizuje kwotę do formatu X.XX"""
+    if not amount:
+        return ""
+    cleaned = _AMOUNT_STRIP.sub('', amount)
+    cleaned = cleaned.replace(',', '.')
+    # Usuń separatory tysięcy
+    parts = cleaned.rsplit('.', 1)
+    if len(parts) == 2 and len(parts[1]) == 2:
+        integer, fraction = parts[0].replace('.', ''), parts[1]
+        # Zwykle już X.XX - cyfry ASCII, bez zer wiodących, do 13 cyfr przed
+        # kropką (15 cyfr znaczących float odwzorowuje dokładnie), więc
+        # float() i :.2f zwróciłyby ten sam napis
+        if (integer.isdigit() and integer.isascii() and fraction.isascii()
+                and len(integer) <= 13 and (len(integer) == 1 or integer[0] != '0')):
+            return integer + '.' + fraction
+        cleaned = integer + '.' + fraction
+    try:
+        return f"{float(cleaned):.2f}"
+    except ValueError:
+        return ""
+
+
+@lru_cache(maxsize=4096)
+def _normalize_nip(nip: str) -> str:
+    """Normalizuje NIP do 10 cyfr."""
+    if not nip:
+        return ""
+    # Zwykle już same cyfry - wtedy nie ma czego usuwać
+    if nip.isdigit():
+        return nip
+    return _NIP_SEPARATORS.sub('', nip)
+
+
+@lru_cache(maxsize=4096)
+def _normalize_date(date_str: str) -> str:
+    """Normalizuje datę do YYYY-MM-DD."""
+    if not date_str:
+        return ""
+
+    # Już kanoniczne YYYY-MM-DD - pierwszy wzorzec zwróciłby to samo
+    if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-' and date_str[:4].isdigit():
+        return date_str
+
+    # Różne formaty - sprawdzamy od najdłuższych z granicami słów
+    for pattern, replacement in _DATE_FORMATS:
+        match = pattern.search(date_str)
+        if match:
+            return replacement(match)
+
+    return date_str
+
+
+@lru_cache(maxsize=1024)
+def _max_amount(amounts: Tuple[str, ...]) -> Optional[str]:
+    """Największa z kwot po normalizacji (X.XX) albo None dla pustej krotki."""
+    if not amounts:
+        return None
+    return f"{max(float(_normalize_amount(a) or 0) for a in amounts):.2f}"
+
 
 class DocumentCategory(Enum):
     """Kategorie dokumentów."""
@@ -26,7 +251,8 @@ class DocumentCategory(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+# Trzy wyniki na dokument w extract_all, tysiące w przetwarzaniu wsadowym
+@dataclass(**_SLOTS)
 class ExtractionResult:
     """Wynik ekstrakcji danych z dokumentu."""
     category: DocumentCategory
@@ -81,45 +307,39 @@ class BaseExtractor(ABC):
 
     def _normalize_amount(self, amount: str) -> str:
         """Normalizuje kwotę do formatu X.XX"""
-        if not amount:
-            return ""
-        cleaned = re.sub(r'[^\d,\.]', '', amount)
-        cleaned = cleaned.replace(',', '.')
-        # Usuń separatory tysięcy
-        parts = cleaned.rsplit('.', 1)
-        if len(parts) == 2 and len(parts[1]) == 2:
-            cleaned = parts[0].replace('.', '') + '.' + parts[1]
-        try:
-            return f"{float(cleaned):.2f}"
-        except ValueError:
-            return ""
+        return _normalize_amount(amount)
 
     def _normalize_nip(self, nip: str) -> str:
         """Normalizuje NIP do 10 cyfr."""
-        if not nip:
-            return ""
-        return re.sub(r'[\s\-]', '', nip)
+        return _normalize_nip(nip)
 
     def _normalize_date(self, date_str: str) -> str:
         """Normalizuje datę do YYYY-MM-DD."""
-        if not date_str:
-            return ""
-
-        # Różne formaty - sprawdzamy od najdłuższych z granicami słów
-        patterns = [
-            (r'\b(\d{4})[/\-\.](\d{2})[/\-\.](\d{2})\b', r'\1-\2-\3'),  # YYYY-MM-DD
-            (r'\b(\d{2})[/\-\.](\d{2})[/\-\.](\d{4})\b', r'\3-\2-\1'),  # DD-MM-YYYY
-            (r'\b(\d{2})[/\-\.](\d{2})[/\-\.](\d{2})\b', lambda m: f'20{m.group(3)}-{m.group(2)}-{m.group(1)}'),  # DD-MM-YY
-        ]
+        return _normalize_date(date_str)
 
-        for pattern, replacement in patterns:
-            match = re.search(pattern, date_str)
-            if match:
-                if callable(replacement):
-                    return replacement(match)
-                return re.sub(pattern, replacement, match.group())
+    @staticmethod
+    def _keyword_confidence(text_lower: str, keywords: List[str], weight: float, *bonuses: float) -> float:
+        """
+        min(1.0, liczba_słów_kluczowych * weight + bonusy).
 
-        return date_str
+        Bonusy są dodawane po kolei, jak w zwykłym wyrażeniu, więc wynik jest
+        identyczny co do bitu. Po osiągnięciu 1.0 dalsze słowa nic nie zmienią,
+        więc skanowanie tekstu się kończy.
+        """
+        count = 0
+        for keyword in keywords:
+            if keyword in text_lower:
+                count += 1
+                confidence = count * weight
+                for bonus in bonuses:
+                    confidence += bonus
+                if confidence >= 1.0:
+                    return 1.0
+
+        confidence = count * weight
+        for bonus in bonuses:
+            confidence += bonus
+        return min(1.0, confidence)
 
 
 class InvoiceExtractor(BaseExtractor):
@@ -132,25 +352,24 @@ class InvoiceExtractor(BaseExtractor):
     ]
 
     def can_extract(self, ocr_result: DocumentOCRResult) -> Tuple[bool, float]:
-        text_lower = ocr_result.full_text.lower()
-
-        # Liczba słów kluczowych
-        keyword_count = sum(1 for kw in self.INVOICE_KEYWORDS if kw in text_lower)
+        text_lower = _lower_text(ocr_result.full_text)
 
         # Czy są NIP-y i kwoty?
         has_nips = len(ocr_result.detected_nips) >= 1
         has_amounts = len(ocr_result.detected_amounts) >= 1
         has_invoice_num = len(ocr_result.detected_invoice_numbers) >= 1
 
-        confidence = min(1.0, keyword_count * 0.15 +
-                        (0.2 if has_nips else 0) +
-                        (0.2 if has_amounts else 0) +
-                        (0.2 if has_invoice_num else 0))
+        # Liczba słów kluczowych
+        confidence = self._keyword_confidence(text_lower, self.INVOICE_KEYWORDS, 0.15,
+                                              (0.2 if has_nips else 0),
+                                              (0.2 if has_amounts else 0),
+                                              (0.2 if has_invoice_num else 0))
 
         return confidence > 0.4, confidence
 
     def extract(self, ocr_result: DocumentOCRResult) -> ExtractionResult:
         text = ocr_result.full_text
+        text_lower = _lower(text)
 
         # NIP sprzedawcy - zwykle pierwszy
         seller_nip = ocr_result.detected_nips[0] if ocr_result.detected_nips else None
@@ -159,13 +378,13 @@ class InvoiceExtractor(BaseExtractor):
         buyer_nip = ocr_result.detected_nips[1] if len(ocr_result.detected_nips) > 1 else None
 
         # Numer faktury
-        invoice_number = self._find_invoice_number(text, ocr_result.detected_invoice_numbers)
+        invoice_number = self._find_invoice_number(text, ocr_result.detected_invoice_numbers, text_lower)
 
         # Data wystawienia
-        issue_date = self._find_issue_date(text, ocr_result.detected_dates)
+        issue_date = self._find_issue_date(text, ocr_result.detected_dates, text_lower)
 
         # Kwoty
-        gross_amount, net_amount, vat_amount = self._find_amounts(text, ocr_result.detected_amounts)
+        gross_amount, net_amount, vat_amount = self._find_amounts(text, ocr_result.detected_amounts, text_lower)
 
         return ExtractionResult(
             category=DocumentCategory.INVOICE,
@@ -186,87 +405,83 @@ class InvoiceExtractor(BaseExtractor):
             }
         )
 
-    def _find_invoice_number(self, text: str, detected: List[str]) -> Optional[str]:
+    def _find_invoice_number(self, text: str, detected: List[str],
+                             text_lower: Optional[str] = None) -> Optional[str]:
         """Znajduje numer faktury."""
-        # Szukaj w kontekście - wymaga przynajmniej jednej cyfry
-        # Używamy (?i) dla case-insensitive i upewniamy się, że słowa kluczowe nie zjadają prefiksów
-        patterns = [
-            r'(?i)\b(?:faktura|fv|rachunek|dokumentu)\b\s*(?:vat)?\s*(?:nr|numer)?[:\s]+([A-Z0-9\/\-]*\d+[A-Z0-9\/\-]*)',
-            r'(?i)\b(?:nr|numer)\b\s*(?:faktury|fv|dokumentu)?[:\s]+([A-Z0-9\/\-]*\d+[A-Z0-9\/\-]*)',
-            # XML patterns
-            r'<InvoiceNumber>([^<]+)</InvoiceNumber>',
-            r'<invoice_number>([^<]+)</invoice_number>',
-            r'<FakturaNumer>([^<]+)</FakturaNumer>',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text)
+        # Szukaj w kontekście, potem w XML
+        match = _INVOICE_NUMBER_EITHER_PATTERN.search(text, text_lower)
+        if match:
+            if match.start(1) >= 0:
+                start, end = match.span(1)
+            else:
+                # Wcześniej w tekście nie ma numeru po "faktura ..." - ale
+                # dalej może być, a ten ma pierwszeństwo przed "nr ..."
+                later = _INVOICE_NUMBER_PATTERN.search(text, text_lower, match.start() + 1)
+                start, end = later.span(1) if later else match.span(2)
+            return text[start:end].strip().upper()
+
+        for pattern in _XML_INVOICE_NUMBER_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1).strip().upper()
 
         # Fallback na wykryte numery
         return detected[0] if detected else None
 
-    def _find_issue_date(self, text: str, detected: List[str]) -> Optional[str]:
+    def _find_issue_date(self, text: str, detected: List[str],
+                         text_lower: Optional[str] = None) -> Optional[str]:
         """Znajduje datę wystawienia."""
         # Szukaj w kontekście - wspiera YYYY-MM-DD i DD-MM-YYYY
-        patterns = [
-            r'(?i)data\s*wystawienia[:\s]*(\d{2,4}[.\-/]\d{2}[.\-/]\d{2,4})',
-            r'(?i)wystawion[ao]\s*(?:dnia)?[:\s]*(\d{2,4}[.\-/]\d{2}[.\-/]\d{2,4})',
-            r'(?i)data[:\s]*(\d{2,4}[.\-/]\d{2}[.\-/]\d{2,4})',
-            # XML patterns
-            r'<IssueDate>([^<]+)</IssueDate>',
-            r'<issue_date>([^<]+)</issue_date>',
-            r'<DataWystawienia>([^<]+)</DataWystawienia>',
-            r'<DataWystaw>([^<]+)</DataWystaw>',
-        ]
+        for pattern in _ISSUE_DATE_PATTERNS:
+            date_str = pattern.search_group(text, text_lower)
+            if date_str:
+                return self._normalize_date(date_str)
 
-        for pattern in patterns:
-            match = re.search(pattern, text)
+        for pattern in _XML_ISSUE_DATE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return self._normalize_date(match.group(1))
 
         return self._normalize_date(detected[0]) if detected else None
 
-    def _find_amounts(self, text: str, detected: List[str]) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    def _find_amounts(self, text: str, detected: List[str],
+                      text_lower: Optional[str] = None) -> Tuple[Optional[str], Optional[str], Optional[str]]:
         """Znajduje kwoty brutto, netto, VAT."""
         gross = None
         net = None
         vat = None
 
         # Szukaj kwoty brutto
-        brutto_match = re.search(r'brutto[:\s]*(\d[\d\s,\.]*\d)', text, re.IGNORECASE)
-        if brutto_match:
-            gross = self._normalize_amount(brutto_match.group(1))
+        brutto = _GROSS_PATTERN.search_group(text, text_lower)
+        if brutto:
+            gross = self._normalize_amount(brutto)
 
         # Szukaj kwoty netto
-        netto_match = re.search(r'netto[:\s]*(\d[\d\s,\.]*\d)', text, re.IGNORECASE)
-        if netto_match:
-            net = self._normalize_amount(netto_match.group(1))
+        netto = _NET_PATTERN.search_group(text, text_lower)
+        if netto:
+            net = self._normalize_amount(netto)
 
         # Szukaj VAT
-        vat_match = re.search(r'(?:vat|podatek)[:\s]*(\d[\d\s,\.]*\d)', text, re.IGNORECASE)
-        if vat_match:
-            vat = self._normalize_amount(vat_match.group(1))
+        vat_str = _VAT_PATTERN.search_group(text, text_lower)
+        if vat_str:
+            vat = self._normalize_amount(vat_str)
 
         # XML patterns - check for structured amounts
-        xml_gross_match = re.search(r'<TotalGrossAmount>([^<]+)</TotalGrossAmount>', text)
+        xml_gross_match = _XML_GROSS_PATTERN.search(text)
         if xml_gross_match:
             gross = self._normalize_amount(xml_gross_match.group(1))
 
-        xml_net_match = re.search(r'<TotalNetAmount>([^<]+)</TotalNetAmount>', text)
+        xml_net_match = _XML_NET_PATTERN.search(text)
         if xml_net_match:
             net = self._normalize_amount(xml_net_match.group(1))
 
-        xml_vat_match = re.search(r'<TotalVATAmount>([^<]+)</TotalVATAmount>', text)
+        xml_vat_match = _XML_VAT_PATTERN.search(text)
         if xml_vat_match:
             vat = self._normalize_amount(xml_vat_match.group(1))
 
         # Jeśli nie znaleziono brutto, weź największą kwotę
         if not gross and detected:
-            amounts = [float(self._normalize_amount(a) or 0) for a in detected]
-            if amounts:
-                gross = f"{max(amounts):.2f}"
+            gross = _max_amount(tuple(detected))
 
         return gross, net, vat
 
@@ -280,28 +495,29 @@ class ReceiptExtractor(BaseExtractor):
     ]
 
     def can_extract(self, ocr_result: DocumentOCRResult) -> Tuple[bool, float]:
-        text_lower = ocr_result.full_text.lower()
-
-        keyword_count = sum(1 for kw in self.RECEIPT_KEYWORDS if kw in text_lower)
+        text_lower = _lower_text(ocr_result.full_text)
 
         # Paragon ma specyficzny format - brak NIP nabywcy, wiele pozycji
         has_fiscal_markers = 'fiskaln' in text_lower or 'paragon' in text_lower
-        has_ptu = 'ptu' in text_lower or bool(re.search(r'\d+%', text_lower))
+        # \d+% nie zaczyna się literałem, więc regex sprawdza każdą cyfrę
+        # w tekście - najpierw szybkie szukanie samego '%'
+        has_ptu = 'ptu' in text_lower or ('%' in text_lower and bool(_PERCENT_PATTERN.search(text_lower)))
         
         # XML-specific detection
-        has_xml_receipt_structure = bool(re.search(r'<receipt[^>]*>.*?</receipt>', text_lower, re.DOTALL))
-        has_xml_receipt_elements = bool(re.search(r'<receiptnumber|<cashregister|<fiscal', text_lower))
+        has_xml_receipt_structure = bool(_XML_RECEIPT_STRUCTURE.search(text_lower))
+        has_xml_receipt_elements = bool(_XML_RECEIPT_ELEMENTS.search(text_lower))
 
-        confidence = min(1.0, keyword_count * 0.15 +
-                        (0.3 if has_fiscal_markers else 0) +
-                        (0.2 if has_ptu else 0) +
-                        (0.4 if has_xml_receipt_structure else 0) +
-                        (0.3 if has_xml_receipt_elements else 0))
+        confidence = self._keyword_confidence(text_lower, self.RECEIPT_KEYWORDS, 0.15,
+                                              (0.3 if has_fiscal_markers else 0),
+                                              (0.2 if has_ptu else 0),
+                                              (0.4 if has_xml_receipt_structure else 0),
+                                              (0.3 if has_xml_receipt_elements else 0))
 
         return confidence > 0.4, confidence
 
     def extract(self, ocr_result: DocumentOCRResult) -> ExtractionResult:
         text = ocr_result.full_text
+        text_lower = _lower(text)
 
         # NIP sprzedawcy
         seller_nip = ocr_result.detected_nips[0] if ocr_result.detected_nips else None
@@ -310,10 +526,10 @@ class ReceiptExtractor(BaseExtractor):
         receipt_date = ocr_result.detected_dates[0] if ocr_result.detected_dates else None
 
         # Kwota - szukaj SUMA lub ostatniej dużej kwoty
-        gross_amount = self._find_total_amount(text, ocr_result.detected_amounts)
+        gross_amount = self._find_total_amount(text, ocr_result.detected_amounts, text_lower)
 
         # Numer paragonu / kasy
-        receipt_num, cash_register = self._find_receipt_identifiers(text)
+        receipt_num, cash_register = self._find_receipt_identifiers(text, text_lower)
 
         return ExtractionResult(
             category=DocumentCategory.RECEIPT,
@@ -331,75 +547,51 @@ class ReceiptExtractor(BaseExtractor):
             }
         )
 
-    def _find_total_amount(self, text: str, detected: List[str]) -> Optional[str]:
+    def _find_total_amount(self, text: str, detected: List[str],
+                           text_lower: Optional[str] = None) -> Optional[str]:
         """Znajduje kwotę SUMA na paragonie."""
-        patterns = [
-            # Main SUMA (not PTU or VAT) - highest priority
-            r'(?i)suma(?!\s+ptu)(?!\s+vat)[:\s]*(\d[\d\s,\.]*\d)',
-            r'(?i)razem[:\s]*(\d[\d\s,\.]*\d)',
-            r'(?i)do zapłaty[:\s]*(\d[\d\s,\.]*\d)',
-            # XML patterns
-            r'<TotalGrossAmount>([^<]+)</TotalGrossAmount>',
-            # HTML patterns - handle tags that separate label from value
-            r'(?i)<span>suma:</span>\s*<span>(\d[\d\s,\.]*\d)</span>',
-            # Flexible pattern for main SUMA only
-            r'(?i)suma(?!\s+ptu)(?!\s+vat)[^0-9]*?(\d[\d\s,\.]*\d)',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return self._normalize_amount(match.group(1))
+        for pattern in _TOTAL_AMOUNT_PATTERNS:
+            amount = pattern.search_group(text, text_lower)
+            if amount:
+                return self._normalize_amount(amount)
 
         # Fallback - największa kwota, ale pomijaj kwoty płatności (gotówka, karta)
-        payment_patterns = [
-            r'(?i)gotówka[:\s]*(\d[\d\s,\.]*\d)',
-            r'(?i)karta[:\s]*(\d[\d\s,\.]*\d)',
-            r'(?i)płatność[:\s]*(\d[\d\s,\.]*\d)',
-            r'(?i)<span>gotówka:</span>\s*<span>(\d[\d\s,\.]*\d)</span>',
-        ]
-        
         # Filter out payment amounts from detected
         non_payment_amounts = []
         for amount in detected:
             is_payment = False
-            for payment_pattern in payment_patterns:
-                if re.search(payment_pattern.replace(r'(\d[\d\s,\.]*\d)', amount), text, re.IGNORECASE):
+            # Kwota trafia do wzorca - z wielkimi literami nie pasuje do text_lower
+            caseless = text_lower is not None and amount == amount.lower()
+            for payment_pattern in _PAYMENT_PATTERNS:
+                pattern = payment_pattern.replace(r'(\d[\d\s,\.]*\d)', amount)
+                if re.search(pattern, text_lower) if caseless else re.search(pattern, text, re.IGNORECASE):
                     is_payment = True
                     break
             if not is_payment:
                 non_payment_amounts.append(amount)
         
-        if non_payment_amounts:
-            amounts = [float(self._normalize_amount(a) or 0) for a in non_payment_amounts]
-            if amounts:
-                return f"{max(amounts):.2f}"
-
-        return None
+        return _max_amount(tuple(non_payment_amounts))
 
-    def _find_receipt_identifiers(self, text: str) -> Tuple[Optional[str], Optional[str]]:
+    def _find_receipt_identifiers(self, text: str,
+                                  text_lower: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
         """Znajduje numer paragonu i numer kasy."""
         receipt_num = None
         cash_register = None
 
         # Numer paragonu - capture full receipt number with slashes
-        receipt_match = re.search(r'(?:nr|numer)\s*(?:paragonu)?[:\s]*([A-Z0-9\/\-]+)', text, re.IGNORECASE)
-        if receipt_match:
-            receipt_num = receipt_match.group(1)
+        receipt_num = _RECEIPT_NUMBER_PATTERN.search_group(text, text_lower)
 
         # Numer kasy
-        cash_match = re.search(r'(?:kasa|stanowisko)[:\s]*(\d+)', text, re.IGNORECASE)
-        if cash_match:
-            cash_register = cash_match.group(1)
+        cash_register = _CASH_REGISTER_PATTERN.search_group(text, text_lower)
 
         # XML patterns
         if not receipt_num:
-            xml_receipt_match = re.search(r'<ReceiptNumber>([^<]+)</ReceiptNumber>', text)
+            xml_receipt_match = _XML_RECEIPT_NUMBER_PATTERN.search(text)
             if xml_receipt_match:
                 receipt_num = xml_receipt_match.group(1)
 
         if not cash_register:
-            xml_cash_match = re.search(r'<CashRegisterNumber>([^<]+)</CashRegisterNumber>', text)
+            xml_cash_match = _XML_CASH_REGISTER_PATTERN.search(text)
             if xml_cash_match:
                 cash_register = xml_cash_match.group(1)
 
@@ -422,31 +614,30 @@ class ContractExtractor(BaseExtractor):
     ]
 
     def can_extract(self, ocr_result: DocumentOCRResult) -> Tuple[bool, float]:
-        text_lower = ocr_result.full_text.lower()
-
-        keyword_count = sum(1 for kw in self.CONTRACT_KEYWORDS if kw in text_lower)
+        text_lower = _lower_text(ocr_result.full_text)
 
         has_contract_header = 'umowa' in text_lower or 'kontrakt' in text_lower
         has_parties = 'strona' in text_lower or 'wykonawca' in text_lower
 
-        confidence = min(1.0, keyword_count * 0.1 +
-                        (0.3 if has_contract_header else 0) +
-                        (0.2 if has_parties else 0))
+        confidence = self._keyword_confidence(text_lower, self.CONTRACT_KEYWORDS, 0.1,
+                                              (0.3 if has_contract_header else 0),
+                                              (0.2 if has_parties else 0))
 
         return confidence > 0.4, confidence
 
     def extract(self, ocr_result: DocumentOCRResult) -> ExtractionResult:
         text = ocr_result.full_text
+        text_lower = _lower(text)
 
         # NIP-y stron
         party1_nip = ocr_result.detected_nips[0] if ocr_result.detected_nips else None
         party2_nip = ocr_result.detected_nips[1] if len(ocr_result.detected_nips) > 1 else None
 
         # Data umowy
-        contract_date = self._find_contract_date(text, ocr_result.detected_dates)
+        contract_date = self._find_contract_date(text, ocr_result.detected_dates, text_lower)
 
         # Numer umowy
-        contract_number = self._find_contract_number(text)
+        contract_number = self._find_contract_number(text, text_lower)
 
         # Typ umowy
         contract_type = self._find_contract_type(text)
@@ -466,45 +657,26 @@ class ContractExtractor(BaseExtractor):
             }
         )
 
-    def _find_contract_date(self, text: str, detected: List[str]) -> Optional[str]:
-        patterns = [
-            r'zawarta\s*(?:w\s*dniu)?[:\s]*(\d{2}[.\-/]\d{2}[.\-/]\d{4})',
-            r'dnia[:\s]*(\d{2}[.\-/]\d{2}[.\-/]\d{4})',
-            r'data[:\s]*(\d{2}[.\-/]\d{2}[.\-/]\d{4})',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return self._normalize_date(match.group(1))
+    def _find_contract_date(self, text: str, detected: List[str],
+                            text_lower: Optional[str] = None) -> Optional[str]:
+        for pattern in _CONTRACT_DATE_PATTERNS:
+            date_str = pattern.search_group(text, text_lower)
+            if date_str:
+                return self._normalize_date(date_str)
 
         return self._normalize_date(detected[0]) if detected else None
 
-    def _find_contract_number(self, text: str) -> Optional[str]:
-        patterns = [
-            r'umowa\s*(?:nr|numer)?[:\s]*([A-Z0-9\/\-]+)',
-            r'(?:nr|numer)\s*(?:umowy)?[:\s]*([A-Z0-9\/\-]+)',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip().upper()
+    def _find_contract_number(self, text: str, text_lower: Optional[str] = None) -> Optional[str]:
+        for pattern in _CONTRACT_NUMBER_PATTERNS:
+            number = pattern.search_group(text, text_lower)
+            if number:
+                return number.strip().upper()
 
         return None
 
     def _find_contract_type(self, text: str) -> Optional[str]:
-        types = {
-            'zlecenie': 'ZLECENIE',
-            'o dzieło': 'DZIELO',
-            'najmu': 'NAJEM',
-            'sprzedaży': 'SPRZEDAZ',
-            'współpracy': 'WSPOLPRACA',
-            'o pracę': 'PRACA',
-        }
-
-        text_lower = text.lower()
-        for keyword, contract_type in types.items():
+        text_lower = _lower_text(text)
+        for keyword, contract_type in _CONTRACT_TYPES:
             if keyword in text_lower:
                 return contract_type
 
@@ -539,6 +711,10 @@ class DocumentExtractor:
             if can_extract and confidence > best_confidence:
                 best_confidence = confidence
                 best_extractor = extractor
+                # Confidence nie przekracza 1.0, a kolejny ekstraktor musi
+                # mieć wyższą, więc dalsze sprawdzanie nic nie zmieni
+                if confidence >= 1.0:
+                    break
 
         if best_extractor:
             logger.info(f"Using {best_extractor.__class__.__name__} with confidence {best_confidence:.2f}")
@@ -560,6 +736,16 @@ class DocumentExtractor:
             }
         )
 
+    def extract_batch(self, ocr_results: Iterable[DocumentOCRResult]) -> List[ExtractionResult]:
+        """
+        Wyciąga dane z wielu dokumentów OCR (jak extract dla każdego).
+
+        Dokumenty są przetwarzane po kolei, więc tekst każdego z nich jest
+        zamieniany na małe litery raz, a znormalizowane kwoty, daty i NIP-y
+        powtarzające się w partii trafiają do wspólnych cache.
+        """
+        return [self.extract(ocr_result) for ocr_result in ocr_results]
+
     def extract_all(self, ocr_result: DocumentOCRResult) -> List[ExtractionResult]:
         """
         Wyciąga dane wszystkimi pasującymi ekstraktorami.
@@ -12,7 +12,7 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import List, Optional, Tuple, Union
+from typing import Iterator, List, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +54,78 @@ class DocumentOCRResult:
     detected_invoice_numbers: List[str] = field(default_factory=list)
 
 
+# Wzorce danych strukturalnych - kompilowane raz przy imporcie modułu,
+# a nie przy każdym wywołaniu extract_structured_data()
+_NIP_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'NIP[:\s]*(\d{3}[-\s]?\d{3}[-\s]?\d{2}[-\s]?\d{2})',
+    r'NIP[:\s]*(\d{10})',
+    r'(\d{3}-\d{3}-\d{2}-\d{2})',
+    r'(?<!\d)(\d{10})(?!\d)',  # 10 cyfr bez kontekstu
+))
+_NIP_SEPARATORS = re.compile(r'[\s\-]')
+_NIP_WEIGHTS = (6, 5, 7, 2, 3, 4, 5, 6, 7)
+
+_AMOUNT_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(\d{1,3}(?:[\s\xa0]?\d{3})*[,\.]\d{2})\s*(?:zł|PLN|złotych)?',
+    r'(?:brutto|netto|razem|suma|do zapłaty)[:\s]*(\d{1,3}(?:[\s\xa0]?\d{3})*[,\.]\d{2})',
+    r'(\d+[,\.]\d{2})\s*(?:zł|PLN)',
+    # XML patterns
+    r'<TotalGrossAmount>([^<]+)</TotalGrossAmount>',
+    r'<TotalNetAmount>([^<]+)</TotalNetAmount>',
+    r'<TotalVATAmount>([^<]+)</TotalVATAmount>',
+    r'<GrossAmount>([^<]+)</GrossAmount>',
+    r'<NetAmount>([^<]+)</NetAmount>',
+    r'<VATAmount>([^<]+)</VATAmount>',
+    r'<UnitPrice>([^<]+)</UnitPrice>',
+))
+
+# XML patterns first (higher priority)
+_DATE_XML_PATTERNS = tuple(re.compile(p) for p in (
+    r'<IssueDate>([^<]+)</IssueDate>',
+    r'<issue_date>([^<]+)</issue_date>',
+    r'<DataWystawienia>([^<]+)</DataWystawienia>',
+    r'<DataWystaw>([^<]+)</DataWystaw>',
+))
+
+# General patterns (lower priority)
+_DATE_PATTERNS = tuple(re.compile(p) for p in (
+    r'\b(\d{2}[-\.\/]\d{2}[-\.\/]\d{4})\b',  # DD-MM-YYYY
+    r'\b(\d{4}[-\.\/]\d{2}[-\.\/]\d{2})\b',  # YYYY-MM-DD
+    r'\b(\d{2}[-\.\/]\d{2}[-\.\/]\d{2})\b',  # DD-MM-YY
+))
+
+_INVOICE_NUMBER_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(?:faktura|fv|rachunek|nr)[:\s]*([A-Z0-9\/\-]+\d+[A-Z0-9\/\-]*)',
+    r'(?:numer|nr)[:\s]*([A-Z]{1,3}[\s\/\-]?\d{1,4}[\s\/\-]?\d{2,4}[\s\/\-]?\d{2,6})',
+    r'(FV[\s\/\-]?\d+[\s\/\-]?\d*[\s\/\-]?\d*)',
+    r'(F[\s\/\-]?\d+[\s\/\-]?\d{4})',
+    # XML patterns
+    r'<InvoiceNumber>([^<]+)</InvoiceNumber>',
+    r'<invoice_number>([^<]+)</invoice_number>',
+    r'<FakturaNumer>([^<]+)</FakturaNumer>',
+    r'<ReceiptNumber>([^<]+)</ReceiptNumber>',
+    r'<receipt_number>([^<]+)</receipt_number>',
+))
+
+
+def _iter_pdf_page_images(pdf_path: str) -> Iterator[Tuple[int, object]]:
+    """Renderuje PDF leniwie - (numer strony, obraz PIL), po jednej stronie."""
+    try:
+        import pdf2image
+    except ImportError:
+        raise ImportError(
+            "pdf2image not installed. Install with: pip install pdf2image"
+        )
+
+    page_count = pdf2image.pdfinfo_from_path(pdf_path)['Pages']
+
+    for page in range(1, page_count + 1):
+        images = pdf2image.convert_from_path(
+            pdf_path, dpi=300, first_page=page, last_page=page,
+        )
+        yield page, images[0]
+
+
 class BaseOCRProcessor(ABC):
     """Bazowa klasa dla procesorów OCR."""
 
@@ -67,6 +139,19 @@ class BaseOCRProcessor(ABC):
         """Przetwarza PDF i zwraca wyniki OCR dla każdej strony."""
         pass
 
+    def iter_pdf_pages(self, pdf_path: Union[str, Path]) -> Iterator[DocumentOCRResult]:
+        """
+        OCR PDF strona po stronie.
+
+        Domyślnie przetwarza cały PDF przez process_pdf; silniki, które
+        potrafią rozpoznać pojedynczą stronę, renderują kolejne strony
+        dopiero wtedy, gdy wywołujący ich potrzebuje.
+        """
+        yield from self.process_pdf(pdf_path)
+
+    def warmup(self, shape: tuple, n: int = 1):
+        """Rozgrzewa silnik przed właściwą pracą (domyślnie nic nie robi)."""
+
     def extract_structured_data(self, text: str) -> dict:
         """
         Wyciąga strukturyzowane dane z tekstu OCR.
@@ -82,115 +167,69 @@ class BaseOCRProcessor(ABC):
 
     def _find_nips(self, text: str) -> List[str]:
         """Znajduje wszystkie NIP-y w tekście."""
-        patterns = [
-            r'NIP[:\s]*(\d{3}[-\s]?\d{3}[-\s]?\d{2}[-\s]?\d{2})',
-            r'NIP[:\s]*(\d{10})',
-            r'(\d{3}-\d{3}-\d{2}-\d{2})',
-            r'(?<!\d)(\d{10})(?!\d)',  # 10 cyfr bez kontekstu
-        ]
-
         results = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
+        seen = set()
+        for pattern in _NIP_PATTERNS:
+            for match in pattern.findall(text):
                 # Normalizuj - usuń separatory
-                nip = re.sub(r'[\s\-]', '', match)
+                nip = _NIP_SEPARATORS.sub('', match)
                 if len(nip) == 10 and nip.isdigit():
                     # Walidacja checksum
-                    weights = [6, 5, 7, 2, 3, 4, 5, 6, 7]
-                    checksum = sum(int(nip[i]) * weights[i] for i in range(9))
+                    checksum = sum(int(nip[i]) * _NIP_WEIGHTS[i] for i in range(9))
                     if checksum % 11 == int(nip[9]):
-                        if nip not in results:
+                        if nip not in seen:
+                            seen.add(nip)
                             results.append(nip)
 
         return results
 
     def _find_amounts(self, text: str) -> List[str]:
         """Znajduje kwoty pieniężne w tekście."""
-        patterns = [
-            r'(\d{1,3}(?:[\s\xa0]?\d{3})*[,\.]\d{2})\s*(?:zł|PLN|złotych)?',
-            r'(?:brutto|netto|razem|suma|do zapłaty)[:\s]*(\d{1,3}(?:[\s\xa0]?\d{3})*[,\.]\d{2})',
-            r'(\d+[,\.]\d{2})\s*(?:zł|PLN)',
-            # XML patterns
-            r'<TotalGrossAmount>([^<]+)</TotalGrossAmount>',
-            r'<TotalNetAmount>([^<]+)</TotalNetAmount>',
-            r'<TotalVATAmount>([^<]+)</TotalVATAmount>',
-            r'<GrossAmount>([^<]+)</GrossAmount>',
-            r'<NetAmount>([^<]+)</NetAmount>',
-            r'<VATAmount>([^<]+)</VATAmount>',
-            r'<UnitPrice>([^<]+)</UnitPrice>',
-        ]
-
         results = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
+        seen = set()
+        for pattern in _AMOUNT_PATTERNS:
+            for match in pattern.findall(text):
                 # Normalizuj
                 amount = match.replace('\xa0', '').replace(' ', '')
                 amount = amount.replace(',', '.')
-                if amount not in results:
+                if amount not in seen:
+                    seen.add(amount)
                     results.append(amount)
 
         return results
 
     def _find_dates(self, text: str) -> List[str]:
         """Znajduje daty w tekście."""
-        # XML patterns first (higher priority)
-        xml_patterns = [
-            r'<IssueDate>([^<]+)</IssueDate>',
-            r'<issue_date>([^<]+)</issue_date>',
-            r'<DataWystawienia>([^<]+)</DataWystawienia>',
-            r'<DataWystaw>([^<]+)</DataWystaw>',
-        ]
-        
-        # General patterns (lower priority)
-        general_patterns = [
-            r'\b(\d{2}[-\.\/]\d{2}[-\.\/]\d{4})\b',  # DD-MM-YYYY
-            r'\b(\d{4}[-\.\/]\d{2}[-\.\/]\d{2})\b',  # YYYY-MM-DD
-            r'\b(\d{2}[-\.\/]\d{2}[-\.\/]\d{2})\b',  # DD-MM-YY
-        ]
-
         results = []
-        
-        # Check XML patterns first
-        for pattern in xml_patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
-                if match not in results:
+        seen = set()
+
+        # Check XML patterns first (higher priority)
+        for pattern in _DATE_XML_PATTERNS:
+            for match in pattern.findall(text):
+                if match not in seen:
+                    seen.add(match)
                     results.append(match)
-        
+
         # Then check general patterns
-        for pattern in general_patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
+        for pattern in _DATE_PATTERNS:
+            for match in pattern.findall(text):
                 # Skip dates that look like they're from XML namespaces
                 if not match.startswith('http://') and not match.startswith('2023/06/29'):
-                    if match not in results:
+                    if match not in seen:
+                        seen.add(match)
                         results.append(match)
 
         return results
 
     def _find_invoice_numbers(self, text: str) -> List[str]:
         """Znajduje numery faktur w tekście."""
-        patterns = [
-            r'(?:faktura|fv|rachunek|nr)[:\s]*([A-Z0-9\/\-]+\d+[A-Z0-9\/\-]*)',
-            r'(?:numer|nr)[:\s]*([A-Z]{1,3}[\s\/\-]?\d{1,4}[\s\/\-]?\d{2,4}[\s\/\-]?\d{2,6})',
-            r'(FV[\s\/\-]?\d+[\s\/\-]?\d*[\s\/\-]?\d*)',
-            r'(F[\s\/\-]?\d+[\s\/\-]?\d{4})',
-            # XML patterns
-            r'<InvoiceNumber>([^<]+)</InvoiceNumber>',
-            r'<invoice_number>([^<]+)</invoice_number>',
-            r'<FakturaNumer>([^<]+)</FakturaNumer>',
-            r'<ReceiptNumber>([^<]+)</ReceiptNumber>',
-            r'<receipt_number>([^<]+)</receipt_number>',
-        ]
-
         results = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
+        seen = set()
+        for pattern in _INVOICE_NUMBER_PATTERNS:
+            for match in pattern.findall(text):
                 normalized = match.strip().upper()
-                if len(normalized) >= 4 and normalized not in results:
+                if len(normalized) >= 4 and normalized not in seen:
+                    seen.add(normalized)
                     results.append(normalized)
 
         return results
@@ -210,10 +249,30 @@ class PaddleOCRProcessor(BaseOCRProcessor):
         use_gpu: bool = False,
         det_model_dir: Optional[str] = None,
         rec_model_dir: Optional[str] = None,
+        enable_hpi: bool = False,
+        precision: Optional[str] = None,  # 'fp32', 'fp16'
+        backend: Optional[str] = None,    # 'paddle', 'onnxruntime', 'openvino', 'tensorrt'
+        rec_batch_num: Optional[int] = None,
+        normalize_size: Optional[Tuple[int, int]] = None,  # (szerokość, wysokość)
+        gpu_mem: Optional[int] = None,  # MB, wstępna pula pamięci GPU
+        pdf_threads: int = 1,
     ):
         self.lang = lang
         self.use_gpu = use_gpu
+        self.gpu_mem = gpu_mem
+        self.pdf_threads = pdf_threads
+        # Stały rozmiar wejścia: każda strona skalowana (z zachowaniem proporcji)
+        # i dopełniana białym tłem do tego samego kształtu, żeby detektor na GPU
+        # nie dobierał algorytmów konwolucji od nowa dla każdego obrazu.
+        self.normalize_size = normalize_size
+        self.enable_hpi = enable_hpi
+        self.precision = precision
+        self.backend = backend
+        # Na CPU batch rozpoznawania > 1 nie przyspiesza, a Paddle alokuje pamięć
+        # proporcjonalnie do batcha (6 -> 1 to ~80% mniej szczytowego RSS).
+        self.rec_batch_num = rec_batch_num if rec_batch_num is not None else (6 if use_gpu else 1)
         self._ocr = None
+        self._warmed_up = False
         self._det_model_dir = det_model_dir
         self._rec_model_dir = rec_model_dir
 
@@ -221,32 +280,117 @@ class PaddleOCRProcessor(BaseOCRProcessor):
         """Lazy initialization silnika OCR."""
         if self._ocr is None:
             try:
+                if self.use_gpu and self.normalize_size:
+                    # Odpowiednik cudnn.benchmark w Paddle - przy stałym kształcie
+                    # wejścia wyszukanie najszybszego algorytmu robione jest raz.
+                    os.environ.setdefault('FLAGS_cudnn_exhaustive_search', '1')
+
                 from paddleocr import PaddleOCR
 
                 # Dla polskiego używamy en (obsługuje dobrze znaki łacińskie w tym polskie)
                 lang = 'en' if self.lang == 'pl' else self.lang
 
-                self._ocr = PaddleOCR(
-                    use_angle_cls=True,
-                    lang=lang,
-                    det_model_dir=self._det_model_dir,
-                    rec_model_dir=self._rec_model_dir,
-                )
+                options = {
+                    'use_angle_cls': True,
+                    'lang': lang,
+                    'det_model_dir': self._det_model_dir,
+                    'rec_model_dir': self._rec_model_dir,
+                    'rec_batch_num': self.rec_batch_num,
+                }
+                # Wysokowydajna inferencja (PaddleOCR >= 3.0): automatyczny wybór
+                # TensorRT / ONNX Runtime / OpenVINO. Opcje przekazujemy tylko gdy
+                # są ustawione, żeby nie psuć starszych wersji PaddleOCR.
+                if self.enable_hpi:
+                    options['enable_hpi'] = True
+                    if self.backend:
+                        options['hpi_config'] = {'backend': self.backend}
+                if self.precision:
+                    options['precision'] = self.precision
+                # Wstępna pula pamięci GPU predyktora (PaddleOCR 2.x, domyślnie
+                # 500 MB). Większa pula oszczędza realokacji przy dużych stronach;
+                # optymalizację pamięci i wyłączenie feed/fetch ops PaddleOCR
+                # włącza w predyktorze sam.
+                if self.use_gpu and self.gpu_mem:
+                    options['gpu_mem'] = self.gpu_mem
+
+                self._ocr = PaddleOCR(**options)
             except ImportError:
                 raise ImportError(
                     "PaddleOCR not installed. Install with: "
                     "pip install paddleocr paddlepaddle"
                 )
 
+    def warmup(self, shape: tuple, n: int = 1):
+        """
+        Rozgrzewa silnik na pustej stronie o zadanym kształcie (H, W, 3).
+
+        Pierwsze wywołanie na GPU alokuje pamięć i wybiera kernele cuDNN
+        dla danego rozmiaru wejścia - robimy to raz, przed właściwymi stronami.
+        """
+        import numpy as np
+
+        self._init_ocr()
+        blank = np.zeros(shape, dtype=np.uint8)
+        for _ in range(n):
+            self._ocr.ocr(blank)
+        self._warmed_up = True
+
     def process_image(self, image_path: Union[str, Path]) -> DocumentOCRResult:
         """Przetwarza obraz."""
+        image_path = str(image_path)
+        if not self.normalize_size:
+            return self._recognize(image_path, image_path)
+
+        from PIL import Image
+
+        with Image.open(image_path) as image:
+            page, scale = self._to_bgr(image)
+        return self._recognize(page, image_path, scale)
+
+    def _to_bgr(self, image) -> tuple:
+        """
+        Konwertuje obraz PIL na tablicę BGR dla PaddleOCR.
+
+        Przy ustawionym normalize_size zwraca stronę przeskalowaną do stałego
+        rozmiaru i współczynnik skali (do przeliczenia bbox na oryginał).
+        """
+        import numpy as np
+        from PIL import Image
+
+        image = image.convert('RGB')
+        scale = 1.0
+
+        if self.normalize_size:
+            target_w, target_h = self.normalize_size
+            scale = min(target_w / image.width, target_h / image.height)
+            resized = image.resize(
+                (max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+                Image.LANCZOS,
+            )
+            image = Image.new('RGB', (target_w, target_h), 'white')
+            image.paste(resized, (0, 0))
+
+        # PaddleOCR oczekuje kolejności kanałów BGR (jak cv2.imread)
+        return np.asarray(image)[:, :, ::-1], scale
+
+    def iter_pdf_pages(self, pdf_path: Union[str, Path]) -> Iterator[DocumentOCRResult]:
+        """OCR PDF strona po stronie - kolejna strona renderowana dopiero na żądanie."""
+        pdf_path = str(pdf_path)
+        for page, image in _iter_pdf_page_images(pdf_path):
+            yield self._recognize_page(image, f"{pdf_path}#page={page}")
+
+    def _recognize_page(self, image, source_file: str) -> DocumentOCRResult:
+        page, scale = self._to_bgr(image)
+        return self._recognize(page, source_file, scale)
+
+    def _recognize(self, image, source_file: str, scale: float = 1.0) -> DocumentOCRResult:
+        """OCR ścieżki do obrazu lub tablicy numpy (BGR, jak z cv2)."""
         import time
         start_time = time.time()
 
         self._init_ocr()
 
-        image_path = str(image_path)
-        result = self._ocr.ocr(image_path)
+        result = self._ocr.ocr(image)
 
         lines = []
         full_text_parts = []
@@ -259,10 +403,10 @@ class PaddleOCRProcessor(BaseOCRProcessor):
                 x_coords = [p[0] for p in bbox_points]
                 y_coords = [p[1] for p in bbox_points]
                 bbox = (
-                    int(min(x_coords)),
-                    int(min(y_coords)),
-                    int(max(x_coords)),
-                    int(max(y_coords)),
+                    int(min(x_coords) / scale),
+                    int(min(y_coords) / scale),
+                    int(max(x_coords) / scale),
+                    int(max(y_coords) / scale),
                 )
 
                 lines.append(OCRResult(
@@ -285,7 +429,7 @@ class PaddleOCRProcessor(BaseOCRProcessor):
             lines=lines,
             average_confidence=avg_confidence,
             engine_used=OCREngine.PADDLE,
-            source_file=image_path,
+            source_file=source_file,
             processing_time_ms=processing_time,
             detected_nips=structured['nips'],
             detected_amounts=structured['amounts'],
@@ -303,20 +447,22 @@ class PaddleOCRProcessor(BaseOCRProcessor):
             )
 
         pdf_path = str(pdf_path)
-        images = pdf2image.convert_from_path(pdf_path, dpi=300)
+        # Poppler rasteryzuje strony równolegle w pdf_threads wątkach
+        images = pdf2image.convert_from_path(
+            pdf_path, dpi=300, thread_count=self.pdf_threads,
+        )
 
-        results = []
-        for i, image in enumerate(images):
-            # Zapisz tymczasowo jako PNG
-            import tempfile
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-                image.save(tmp.name, 'PNG')
-                result = self.process_image(tmp.name)
-                result.source_file = f"{pdf_path}#page={i+1}"
-                results.append(result)
-                os.unlink(tmp.name)
+        # Strony trafiają do silnika jako tablice w pamięci - bez zapisu
+        # i ponownego dekodowania tymczasowych PNG dla każdej strony.
+        pages = [self._to_bgr(image) for image in images]
 
-        return results
+        if self.use_gpu and pages and not self._warmed_up:
+            self.warmup(pages[0][0].shape)
+
+        return [
+            self._recognize(page, f"{pdf_path}#page={i+1}", scale)
+            for i, (page, scale) in enumerate(pages)
+        ]
 
 
 class TesseractOCRProcessor(BaseOCRProcessor):
@@ -330,9 +476,11 @@ class TesseractOCRProcessor(BaseOCRProcessor):
         self,
         lang: str = 'pol+eng',
         config: str = '--oem 3 --psm 6',
+        pdf_threads: int = 1,
     ):
         self.lang = lang
         self.config = config
+        self.pdf_threads = pdf_threads
         self._check_tesseract()
 
     def _check_tesseract(self):
@@ -349,15 +497,28 @@ class TesseractOCRProcessor(BaseOCRProcessor):
 
     def process_image(self, image_path: Union[str, Path]) -> DocumentOCRResult:
         """Przetwarza obraz."""
+        from PIL import Image
+
+        with Image.open(image_path) as image:
+            return self._recognize(image, str(image_path))
+
+    def iter_pdf_pages(self, pdf_path: Union[str, Path]) -> Iterator[DocumentOCRResult]:
+        """OCR PDF strona po stronie - kolejna strona renderowana dopiero na żądanie."""
+        pdf_path = str(pdf_path)
+        for page, image in _iter_pdf_page_images(pdf_path):
+            yield self._recognize_page(image, f"{pdf_path}#page={page}")
+
+    def _recognize_page(self, image, source_file: str) -> DocumentOCRResult:
+        return self._recognize(image, source_file)
+
+    def _recognize(self, image, source_file: str) -> DocumentOCRResult:
+        """OCR obrazu PIL."""
         import time
 
         import pytesseract
-        from PIL import Image
 
         start_time = time.time()
 
-        image = Image.open(image_path)
-
         # OCR z detalami
         data = pytesseract.image_to_data(
             image,
@@ -429,7 +590,7 @@ class TesseractOCRProcessor(BaseOCRProcessor):
             lines=lines,
             average_confidence=avg_confidence,
             engine_used=OCREngine.TESSERACT,
-            source_file=str(image_path),
+            source_file=source_file,
             processing_time_ms=processing_time,
             detected_nips=structured['nips'],
             detected_amounts=structured['amounts'],
@@ -445,19 +606,16 @@ class TesseractOCRProcessor(BaseOCRProcessor):
             raise ImportError("pdf2image not installed")
 
         pdf_path = str(pdf_path)
-        images = pdf2image.convert_from_path(pdf_path, dpi=300)
-
-        results = []
-        for i, image in enumerate(images):
-            import tempfile
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-                image.save(tmp.name, 'PNG')
-                result = self.process_image(tmp.name)
-                result.source_file = f"{pdf_path}#page={i+1}"
-                results.append(result)
-                os.unlink(tmp.name)
+        # Poppler rasteryzuje strony równolegle w pdf_threads wątkach
+        images = pdf2image.convert_from_path(
+            pdf_path, dpi=300, thread_count=self.pdf_threads,
+        )
 
-        return results
+        # pytesseract przyjmuje obrazy PIL bezpośrednio - bez plików tymczasowych
+        return [
+            self._recognize(image, f"{pdf_path}#page={i+1}")
+            for i, image in enumerate(images)
+        ]
 
 
 class OCRProcessor:
@@ -473,11 +631,25 @@ class OCRProcessor:
         fallback_engine: OCREngine = OCREngine.PADDLE,
         lang: str = 'pl',
         use_gpu: bool = False,
+        enable_hpi: bool = False,
+        precision: Optional[str] = None,
+        backend: Optional[str] = None,
+        rec_batch_num: Optional[int] = None,
+        normalize_size: Optional[Tuple[int, int]] = None,
+        gpu_mem: Optional[int] = None,
+        pdf_threads: int = 1,
     ):
         self.preferred_engine = preferred_engine
         self.fallback_engine = fallback_engine
         self.lang = lang
         self.use_gpu = use_gpu
+        self.enable_hpi = enable_hpi
+        self.precision = precision
+        self.backend = backend
+        self.rec_batch_num = rec_batch_num
+        self.normalize_size = normalize_size
+        self.gpu_mem = gpu_mem
+        self.pdf_threads = pdf_threads
 
         self._processor: Optional[BaseOCRProcessor] = None
         self._active_engine: Optional[OCREngine] = None
@@ -514,6 +686,13 @@ class OCRProcessor:
                     self._processor = PaddleOCRProcessor(
                         lang=self.lang,
                         use_gpu=self.use_gpu,
+                        enable_hpi=self.enable_hpi,
+                        precision=self.precision,
+                        backend=self.backend,
+                        rec_batch_num=self.rec_batch_num,
+                        normalize_size=self.normalize_size,
+                        gpu_mem=self.gpu_mem,
+                        pdf_threads=self.pdf_threads,
                     )
                     self._active_engine = OCREngine.PADDLE
                     logger.info("Using PaddleOCR engine")
@@ -522,6 +701,7 @@ class OCRProcessor:
                 elif engine == OCREngine.TESSERACT:
                     self._processor = TesseractOCRProcessor(
                         lang='pol+eng' if self.lang == 'pl' else self.lang,
+                        pdf_threads=self.pdf_threads,
                     )
                     self._active_engine = OCREngine.TESSERACT
                     logger.info("Using Tesseract engine")
@@ -543,6 +723,18 @@ class OCRProcessor:
         """Zwraca aktualnie używany silnik OCR."""
         return self._active_engine
 
+    @property
+    def is_thread_safe(self) -> bool:
+        """
+        Czy process() można wywoływać równolegle z kilku wątków.
+
+        Wybiera silnik, jeśli jeszcze nie został wybrany. Tesseract uruchamia
+        osobny proces na każde wywołanie, a pojedynczy predyktor PaddleOCR
+        nie jest bezpieczny wątkowo.
+        """
+        self._init_processor()
+        return self._active_engine == OCREngine.TESSERACT
+
     def process(
         self, 
         file_path: Union[str, Path]
@@ -571,6 +763,22 @@ class OCRProcessor:
         processor = self._init_processor()
         return processor.process_pdf(pdf_path)
 
+    def iter_pdf_pages(self, pdf_path: Union[str, Path]) -> Iterator[DocumentOCRResult]:
+        """Przetwarza PDF leniwie, strona po stronie."""
+        processor = self._init_processor()
+        return processor.iter_pdf_pages(pdf_path)
+
+    def warmup(self, shape: Optional[tuple] = None, n: int = 2):
+        """
+        Rozgrzewa silnik OCR na pustych stronach przed przetwarzaniem wsadowym.
+
+        Domyślny kształt to normalize_size albo strona A4 w 300 DPI.
+        """
+        if shape is None:
+            width, height = self.normalize_size or (2480, 3508)
+            shape = (height, width, 3)
+        self._init_processor().warmup(shape, n=n)
+
 
 def preprocess_image_for_ocr(
         image_path: Union[str, Path], 
@@ -7,10 +7,15 @@ w jeden spójny proces.
 
 import hashlib
 import logging
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from .document_id import (
     AmountNormalizer,
@@ -106,6 +111,13 @@ class DocumentPipeline:
         id_prefix: str = "DOC",
         lang: str = "pl",
         use_gpu: bool = False,
+        enable_hpi: bool = False,
+        precision: Optional[str] = None,
+        backend: Optional[str] = None,
+        rec_batch_num: Optional[int] = None,
+        normalize_size: Optional[Tuple[int, int]] = None,
+        gpu_mem: Optional[int] = None,
+        pdf_threads: int = 1,
     ):
         """
         Args:
@@ -113,11 +125,42 @@ class DocumentPipeline:
             id_prefix: Prefiks identyfikatorów (domyślnie DOC)
             lang: Język dokumentów (pl, en)
             use_gpu: Czy używać GPU (domyślnie False dla CPU)
+            enable_hpi: Wysokowydajna inferencja PaddleOCR (TensorRT/ONNX/OpenVINO)
+            precision: Precyzja inferencji PaddleOCR (fp32, fp16)
+            backend: Backend inferencji dla enable_hpi (paddle, onnxruntime,
+                openvino, tensorrt); domyślnie wybierany automatycznie
+            rec_batch_num: Batch rozpoznawania PaddleOCR (domyślnie 1 na CPU, 6 na GPU)
+            normalize_size: Stały rozmiar stron (szerokość, wysokość) przed OCR
+                w PaddleOCR; przydatne przy batchach na GPU
+            gpu_mem: Wstępna pula pamięci GPU PaddleOCR w MB (tylko z use_gpu)
+            pdf_threads: Liczba wątków Popplera renderujących strony PDF
         """
+        # Konfiguracja potrzebna do odtworzenia pipeline'u w workerach puli
+        self._config: Dict[str, Any] = {
+            'ocr_engine': ocr_engine,
+            'id_prefix': id_prefix,
+            'lang': lang,
+            'use_gpu': use_gpu,
+            'enable_hpi': enable_hpi,
+            'precision': precision,
+            'backend': backend,
+            'rec_batch_num': rec_batch_num,
+            'normalize_size': normalize_size,
+            'gpu_mem': gpu_mem,
+            'pdf_threads': pdf_threads,
+        }
+
         self.ocr = OCRProcessor(
             preferred_engine=ocr_engine,
             lang=lang,
             use_gpu=use_gpu,
+            enable_hpi=enable_hpi,
+            precision=precision,
+            backend=backend,
+            rec_batch_num=rec_batch_num,
+            normalize_size=normalize_size,
+            gpu_mem=gpu_mem,
+            pdf_threads=pdf_threads,
         )
         self.extractor = DocumentExtractor()
         self.id_generator = DocumentIDGenerator(prefix=id_prefix)
@@ -143,33 +186,28 @@ class DocumentPipeline:
         file_path = Path(file_path)
         logger.info(f"Processing: {file_path}")
 
-        suffix = file_path.suffix.lower()
-        
         # 1. Pozyskanie tekstu (z OCR lub bezpośrednio z pliku)
+        ocr_result = self._read_document(file_path)
+
+        # 2-4. Ekstrakcja, typ dokumentu i ID
+        result = self._identify(file_path, ocr_result, force_type)
+
+        # 5. Sprawdzenie duplikatów
+        result.duplicate_of = self._check_duplicate(result.document_id, result.canonical_string)
+        result.is_duplicate = result.duplicate_of is not None
+
+        return result
+
+    def _read_document(self, file_path: Path) -> DocumentOCRResult:
+        """Pozyskuje tekst dokumentu - OCR dla obrazów i PDF, odczyt dla plików tekstowych."""
+        suffix = file_path.suffix.lower()
+
         if suffix in ['.pdf', '.png', '.jpg', '.jpeg', '.bmp', '.tiff']:
             ocr_result = self.ocr.process(file_path)
 
             # Dla PDF bierz pierwszą stronę (lub połącz)
             if isinstance(ocr_result, list):
-                if len(ocr_result) == 0:
-                    raise ValueError(f"No pages found in PDF: {file_path}")
-                # Połącz tekst ze wszystkich stron
-                combined_text = "\n\n".join(r.full_text for r in ocr_result)
-                combined_lines = []
-                for r in ocr_result:
-                    combined_lines.extend(r.lines)
-
-                ocr_result = DocumentOCRResult(
-                    full_text=combined_text,
-                    lines=combined_lines,
-                    average_confidence=sum(r.average_confidence for r in ocr_result) / len(ocr_result),
-                    engine_used=ocr_result[0].engine_used,
-                    source_file=str(file_path),
-                    detected_nips=list(set(sum((r.detected_nips for r in ocr_result), []))),
-                    detected_amounts=list(set(sum((r.detected_amounts for r in ocr_result), []))),
-                    detected_dates=list(set(sum((r.detected_dates for r in ocr_result), []))),
-                    detected_invoice_numbers=list(set(sum((r.detected_invoice_numbers for r in ocr_result), []))),
-                )
+                ocr_result = self._merge_pages(ocr_result, file_path)
         elif suffix in ['.xml', '.html', '.htm', '.txt']:
             # Czytaj bezpośrednio z pliku
             try:
@@ -200,6 +238,15 @@ class DocumentPipeline:
         else:
             raise ValueError(f"Unsupported file format: {suffix}")
 
+        return ocr_result
+
+    def _identify(
+        self,
+        file_path: Path,
+        ocr_result: DocumentOCRResult,
+        force_type: Optional[DocumentType] = None,
+    ) -> ProcessedDocument:
+        """Ekstrakcja danych i generowanie ID z gotowego wyniku OCR (bez duplikatów)."""
         # 2. Ekstrakcja danych
         extraction = self.extractor.extract(ocr_result)
 
@@ -209,20 +256,6 @@ class DocumentPipeline:
         # 4. Generowanie ID
         document_id, canonical_string = self._generate_id(extraction, doc_type, ocr_result)
 
-        # 5. Sprawdzenie duplikatów
-        is_duplicate = False
-        duplicate_of = None
-
-        prior_id = self._processed_ids.get(canonical_string)
-        if prior_id and prior_id != document_id:
-            is_duplicate = True
-            duplicate_of = prior_id
-            logger.warning(f"Duplicate detected: {document_id} is duplicate of {duplicate_of}")
-        else:
-            # First time seen, or the same document re-processed (same canonical -> same
-            # id): re-seeing one document is not a duplicate of a distinct prior document.
-            self._processed_ids[canonical_string] = document_id
-
         return ProcessedDocument(
             document_id=document_id,
             document_type=doc_type,
@@ -231,14 +264,48 @@ class DocumentPipeline:
             ocr_result=ocr_result,
             ocr_confidence=ocr_result.average_confidence,
             source_file=str(file_path),
-            is_duplicate=is_duplicate,
-            duplicate_of=duplicate_of,
         )
 
+    @staticmethod
+    def _merge_pages(pages: List[DocumentOCRResult], file_path: Path) -> DocumentOCRResult:
+        """Łączy wyniki OCR stron PDF w jeden wynik dla całego dokumentu."""
+        if len(pages) == 0:
+            raise ValueError(f"No pages found in PDF: {file_path}")
+        # Połącz tekst ze wszystkich stron
+        combined_text = "\n\n".join(r.full_text for r in pages)
+        combined_lines = []
+        for r in pages:
+            combined_lines.extend(r.lines)
+
+        return DocumentOCRResult(
+            full_text=combined_text,
+            lines=combined_lines,
+            average_confidence=sum(r.average_confidence for r in pages) / len(pages),
+            engine_used=pages[0].engine_used,
+            source_file=str(file_path),
+            detected_nips=list(set(sum((r.detected_nips for r in pages), []))),
+            detected_amounts=list(set(sum((r.detected_amounts for r in pages), []))),
+            detected_dates=list(set(sum((r.detected_dates for r in pages), []))),
+            detected_invoice_numbers=list(set(sum((r.detected_invoice_numbers for r in pages), []))),
+        )
+
+    def _check_duplicate(self, document_id: str, canonical_string: str) -> Optional[str]:
+        """Zwraca ID wcześniejszego dokumentu, jeśli to duplikat, w przeciwnym razie None."""
+        prior_id = self._processed_ids.get(canonical_string)
+        if prior_id and prior_id != document_id:
+            logger.warning(f"Duplicate detected: {document_id} is duplicate of {prior_id}")
+            return prior_id
+
+        # First time seen, or the same document re-processed (same canonical -> same
+        # id): re-seeing one document is not a duplicate of a distinct prior document.
+        self._processed_ids[canonical_string] = document_id
+        return None
+
     def process_batch(
         self,
-        file_paths: List[Union[str, Path]],
+        file_paths: Iterable[Union[str, Path]],
         skip_duplicates: bool = True,
+        workers: int = 1,
     ) -> List[ProcessedDocument]:
         """
         Przetwarza wiele plików.
@@ -246,28 +313,105 @@ class DocumentPipeline:
         Args:
             file_paths: Lista ścieżek do plików
             skip_duplicates: Czy pomijać duplikaty w wynikach
+            workers: Liczba równoległych workerów (1 = sekwencyjnie). Każdy worker
+                buduje własny pipeline; duplikaty są wykrywane w procesie głównym.
 
         Returns:
             Lista ProcessedDocument
         """
         results = []
 
-        for file_path in file_paths:
-            try:
-                result = self.process(file_path)
-
-                if skip_duplicates and result.is_duplicate:
-                    logger.info(f"Skipping duplicate: {file_path}")
-                    continue
-
-                results.append(result)
+        for file_path, result in self.process_batch_stream(file_paths, workers=workers):
+            if result is None:
+                continue
 
-            except Exception as e:
-                logger.error(f"Error processing {file_path}: {e}")
+            if skip_duplicates and result.is_duplicate:
+                logger.info(f"Skipping duplicate: {file_path}")
                 continue
 
+            results.append(result)
+
         return results
 
+    def process_batch_stream(
+        self,
+        file_paths: Iterable[Union[str, Path]],
+        workers: int = 1,
+        return_exceptions: bool = False,
+        warmup: bool = False,
+    ) -> Iterator[Tuple[Union[str, Path], Optional[ProcessedDocument]]]:
+        """
+        Przetwarza pliki, zwracając pary (ścieżka, wynik) w kolejności wejścia.
+
+        Wynik to None, jeśli przetwarzanie pliku się nie powiodło (błąd jest
+        logowany), a przy return_exceptions=True - zgłoszony wyjątek. Duplikaty
+        są oznaczone, ale nie pomijane. Przy workers=1 ścieżki są pobierane
+        leniwie, więc można podać generator. warmup=True rozgrzewa silnik OCR
+        tam, gdzie faktycznie pracuje - tutaj albo w każdym workerze puli.
+        """
+        workers = max(1, min(workers, os.cpu_count() or 1))
+
+        if workers > 1:
+            # Pula i tak zleca wszystkie zadania od razu
+            file_paths = list(file_paths)
+            workers = min(workers, len(file_paths))
+
+        if workers > 1:
+            processed = self._process_parallel(file_paths, workers, warmup)
+        else:
+            if warmup:
+                logger.info("Warming up OCR engine")
+                self.ocr.warmup()
+            processed = map(self._process_or_error, file_paths)
+
+        # Ścieżki odtwarzamy z wyników, bo generator wejścia można czytać raz
+        for file_path, result in processed:
+            if isinstance(result, Exception) and not return_exceptions:
+                result = None
+            yield file_path, result
+
+    def _process_or_error(self, file_path: Union[str, Path]) -> Tuple[Union[str, Path], Any]:
+        """Przetwarza plik; zwraca (ścieżka, wynik) albo (ścieżka, wyjątek) i loguje błąd."""
+        try:
+            return file_path, self.process(file_path)
+        except Exception as e:
+            logger.error(f"Error processing {file_path}: {e}")
+            return file_path, e
+
+    def _process_parallel(
+        self, file_paths: List[Union[str, Path]], workers: int, warmup: bool = False,
+    ):
+        """
+        Przetwarza pliki w puli workerów, zachowując kolejność wejścia.
+
+        Na CPU używa procesów (OCR jest CPU-bound), na GPU wątków (jeden kontekst
+        urządzenia). Duplikaty są oznaczane ponownie w procesie głównym, bo cache
+        każdego workera widzi tylko swoje pliki. Każdy worker ma własny model,
+        więc przy warmup=True rozgrzewa go sam.
+        """
+        use_gpu = self._config['use_gpu']
+        executor_cls = ThreadPoolExecutor if use_gpu else ProcessPoolExecutor
+
+        with executor_cls(
+            max_workers=workers,
+            initializer=_init_batch_worker,
+            initargs=(self._config, not use_gpu, warmup),
+        ) as executor:
+            try:
+                for file_path, result in executor.map(
+                    _process_in_worker, file_paths, chunksize=4,
+                ):
+                    if isinstance(result, ProcessedDocument):
+                        result.duplicate_of = self._check_duplicate(
+                            result.document_id, result.canonical_string
+                        )
+                        result.is_duplicate = result.duplicate_of is not None
+                    yield file_path, result
+            finally:
+                # Przerwany odbiór (np. stop po pierwszym błędzie) - nie czekamy
+                # na OCR plików, których wynik nikogo już nie interesuje
+                executor.shutdown(wait=True, cancel_futures=True)
+
     def _map_category_to_type(self, category: DocumentCategory) -> DocumentType:
         """Mapuje kategorię ekstrakcji na typ dokumentu."""
         mapping = {
@@ -376,9 +520,40 @@ class DocumentPipeline:
 
         Przydatne do sprawdzenia czy skan odpowiada oryginałowi.
         """
-        result = self.process(file_path)
+        result = self.process_until_match(file_path, expected_id)
         return result.document_id == expected_id
 
+    def process_until_match(
+        self,
+        file_path: Union[str, Path],
+        expected_id: str,
+    ) -> ProcessedDocument:
+        """
+        Przetwarza dokument, kończąc OCR gdy tylko ID zgodzi się z oczekiwanym.
+
+        PDF jest rozpoznawany strona po stronie; po każdej stronie ID liczony
+        jest z dotychczasowego tekstu. Zgodny skrót potwierdza pola kanoniczne,
+        więc pozostałych stron nie trzeba już rozpoznawać. Bez zgodności wynik
+        jest taki sam jak z process(). Wynik nie trafia do cache duplikatów.
+        """
+        file_path = Path(file_path)
+        logger.info(f"Verifying: {file_path}")
+
+        if file_path.suffix.lower() != '.pdf':
+            return self._identify(file_path, self._read_document(file_path))
+        pages = []
+        result = None
+        for page in self.ocr.iter_pdf_pages(file_path):
+            pages.append(page)
+            result = self._identify(file_path, self._merge_pages(pages, file_path))
+            if result.document_id == expected_id:
+                logger.info(f"ID matched after page {len(pages)}")
+                break
+
+        if result is None:
+            raise ValueError(f"No pages found in PDF: {file_path}")
+        return result
+
     def get_canonical_string(
         self,
         file_path: Union[str, Path],
@@ -388,17 +563,90 @@ class DocumentPipeline:
         return result.canonical_string
 
 
-# Funkcje pomocnicze dla szybkiego użycia
+# Workery przetwarzania wsadowego
+
+_worker_state = threading.local()
 
-_default_pipeline: Optional[DocumentPipeline] = None
 
+def _init_batch_worker(
+    config: Dict[str, Any], limit_threads: bool, warmup: bool = False,
+) -> None:
+    """Buduje pipeline raz na proces/wątek workera (ciepły cache modeli OCR)."""
+    if limit_threads:
+        # Jeden wątek OpenMP na proces - równoległość daje pula, nie Tesseract/Paddle
+        os.environ['OMP_THREAD_LIMIT'] = '1'
+    _worker_state.pipeline = DocumentPipeline(**config)
+    if warmup:
+        _worker_state.pipeline.ocr.warmup()
 
-def get_pipeline(ocr_engine: OCREngine = OCREngine.TESSERACT) -> DocumentPipeline:
-    """Zwraca domyślny pipeline (lazy init)."""
-    global _default_pipeline
-    if _default_pipeline is None or _default_pipeline.ocr.preferred_engine != ocr_engine:
-        _default_pipeline = DocumentPipeline(ocr_engine=ocr_engine)
-    return _default_pipeline
+
+def _process_in_worker(file_path: Union[str, Path]) -> Tuple[Union[str, Path], Any]:
+    """Przetwarza pojedynczy plik w workerze puli."""
+    file_path, result = _worker_state.pipeline._process_or_error(file_path)
+    if isinstance(result, Exception):
+        # Wyjątek wraca do procesu głównego przez pickle - nie każdy się da
+        try:
+            pickle.dumps(result)
+        except Exception:
+            result = RuntimeError(str(result))
+    return file_path, result
+
+
+# Funkcje pomocnicze dla szybkiego użycia
+
+def get_pipeline(
+    ocr_engine: OCREngine = OCREngine.TESSERACT,
+    id_prefix: str = "DOC",
+    lang: str = "pl",
+    use_gpu: bool = False,
+    enable_hpi: bool = False,
+    precision: Optional[str] = None,
+    backend: Optional[str] = None,
+    rec_batch_num: Optional[int] = None,
+    normalize_size: Optional[Tuple[int, int]] = None,
+    gpu_mem: Optional[int] = None,
+    pdf_threads: int = 1,
+) -> DocumentPipeline:
+    """
+    Zwraca współdzielony pipeline dla danej konfiguracji (lazy init).
+
+    Inicjalizacja silnika OCR jest kosztowna, więc pipeline jest budowany raz
+    na każdą kombinację parametrów i ponownie używany.
+    """
+    return _cached_pipeline(
+        ocr_engine, id_prefix, lang, use_gpu,
+        enable_hpi, precision, backend, rec_batch_num,
+        tuple(normalize_size) if normalize_size else None, gpu_mem, pdf_threads,
+    )
+
+
+@lru_cache(maxsize=8)
+def _cached_pipeline(
+    ocr_engine: OCREngine,
+    id_prefix: str,
+    lang: str,
+    use_gpu: bool,
+    enable_hpi: bool,
+    precision: Optional[str],
+    backend: Optional[str],
+    rec_batch_num: Optional[int],
+    normalize_size: Optional[Tuple[int, int]],
+    gpu_mem: Optional[int],
+    pdf_threads: int,
+) -> DocumentPipeline:
+    return DocumentPipeline(
+        ocr_engine=ocr_engine,
+        id_prefix=id_prefix,
+        lang=lang,
+        use_gpu=use_gpu,
+        enable_hpi=enable_hpi,
+        precision=precision,
+        backend=backend,
+        rec_batch_num=rec_batch_num,
+        normalize_size=normalize_size,
+        gpu_mem=gpu_mem,
+        pdf_threads=pdf_threads,
+    )
 
 
 def process_document(file_path: Union[str, Path], ocr_engine: OCREngine = OCREngine.TESSERACT, use_ocr: bool = True) -> ProcessedDocument:
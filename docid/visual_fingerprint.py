@@ -31,6 +31,7 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
@@ -194,6 +195,10 @@ def _ahash(gray: "Image.Image") -> str:
 def _dhash(gray: "Image.Image") -> str:
     # 9x8 -> porównanie sąsiadów w poziomie -> 8x8 bitów
     small = gray.resize((9, 8), Image.Resampling.LANCZOS)
+    if NUMPY_AVAILABLE:
+        pix = np.asarray(small, dtype=np.uint8)
+        return np.packbits(pix[:, :-1] > pix[:, 1:]).tobytes().hex()
+
     pixels = list(small.tobytes())
     bits: List[int] = []
     for row in range(8):
@@ -211,13 +216,13 @@ def _phash(gray: "Image.Image") -> str:
 
     if NUMPY_AVAILABLE:
         pix = np.asarray(small, dtype=np.float64)
-        dct = _dct2(pix)
-        block = dct[:8, :8]
+        # Liczymy od razu tylko blok 8x8 niskich częstotliwości (8x32 @ 32x32 @ 32x8)
+        # zamiast pełnej transformaty 32x32, z której i tak odrzucamy 15/16.
+        basis = _dct_basis(size)[:8]
+        flat = (basis @ pix @ basis.T).ravel()
         # pomijamy składową DC (0,0) przy liczeniu mediany
-        flat = block.flatten()
         med = np.median(flat[1:])
-        bits = [1 if v > med else 0 for v in flat]
-        return _bits_to_hex(bits)
+        return np.packbits(flat > med).tobytes().hex()
 
     # Fallback czysto-Pythonowy (wolny, ale poprawny)
     pixels = list(small.tobytes())
@@ -229,12 +234,13 @@ def _phash(gray: "Image.Image") -> str:
     return _bits_to_hex([1 if v > med else 0 for v in block])
 
 
-def _dct2(matrix: "np.ndarray") -> "np.ndarray":
-    """Dwuwymiarowe DCT-II przez macierze bazowe (bez scipy)."""
-    n = matrix.shape[0]
+@lru_cache(maxsize=4)
+def _dct_basis(n: int) -> "np.ndarray":
+    """Macierz bazowa DCT-II rozmiaru n x n (liczona raz na rozmiar)."""
     k = np.arange(n)
     basis = np.cos(np.pi * (2 * k[:, None] + 1) * k[None, :] / (2 * n))
-    return basis @ matrix @ basis.T
+    basis.flags.writeable = False
+    return basis
 
 
 def _dct2_py(matrix: List[List[float]], n: int) -> List[List[float]]:  # pragma: no cover
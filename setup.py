@@ -43,6 +43,11 @@ setup(
         "tesseract": [
             "pytesseract>=0.3.10",
         ],
+        "fast": [
+            "orjson>=3.6.0",
+            "blake3>=0.3.0",
+            "xxhash>=3.0.0",
+        ],
         "all": [
             "paddleocr>=2.6.0",
             "paddlepaddle>=2.4.0",
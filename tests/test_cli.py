@@ -0,0 +1,35 @@
+"""
+Testy CLI docid (bez uruchamiania OCR).
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from docid.cli import main
+from docid.pipeline import DocumentPipeline
+
+
+class TestVerify:
+    """Testy podkomendy verify."""
+
+    def test_common_options_configure_pipeline(self, monkeypatch, capsys):
+        used = []
+
+        def fake_process_until_match(self, file_path, expected_id):
+            used.append(self)
+            return SimpleNamespace(document_id=expected_id)
+
+        monkeypatch.setattr(DocumentPipeline, "process_until_match", fake_process_until_match)
+
+        with pytest.raises(SystemExit) as exc:
+            main(["verify", "f.pdf", "TST-FV-0000000000000000",
+                  "--prefix", "TST", "--gpu", "--hpi", "--precision", "fp16"])
+
+        assert exc.value.code == 0
+        assert "MATCH" in capsys.readouterr().out
+        (pipeline,) = used
+        assert pipeline.id_generator.prefix == "TST"
+        assert pipeline.ocr.use_gpu is True
+        assert pipeline._config["enable_hpi"] is True
+        assert pipeline._config["precision"] == "fp16"
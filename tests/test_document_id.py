@@ -6,6 +6,7 @@ import pytest
 
 from docid.document_id import (
     AmountNormalizer,
+    CanonicalData,
     DateNormalizer,
     DocumentIDGenerator,
     DocumentType,
@@ -230,6 +231,46 @@ class TestDocumentIDGenerator:
 
         assert doc_id.startswith("TEST-FV-")
 
+    def test_generate_batch_matches_single(self, generator):
+        """Test generowania ID partiami - wynik jak dla pojedynczych wywołań."""
+        canonicals = [
+            CanonicalData(DocumentType.INVOICE, "5213017228|FV/2025/00142|2025-01-15|1230.50"),
+            CanonicalData(DocumentType.RECEIPT, "5213017228|2025-01-15|37.88"),
+            CanonicalData(DocumentType.OTHER, "zażółć gęślą jaźń"),
+        ]
+
+        assert generator.generate_batch(canonicals) == [
+            generator._generate_id(c) for c in canonicals
+        ]
+        assert generator.generate_batch([]) == []
+
+    def test_blake2b_is_opt_in(self, generator):
+        """Test opcjonalnego BLAKE2b - domyślne ID się nie zmieniają."""
+        canonical = CanonicalData(DocumentType.INVOICE, "5213017228|FV/2025/00142|2025-01-15|1230.50")
+        blake = DocumentIDGenerator(hash_algo="blake2b")
+
+        assert generator.hash_algo == "sha256"
+        assert DocumentIDGenerator(hash_algo="sha256")._generate_id(canonical) == generator._generate_id(canonical)
+
+        doc_id = blake._generate_id(canonical)
+        assert doc_id != generator._generate_id(canonical)
+        assert len(doc_id.split('-')[2]) == 16
+        assert blake.verify_id(doc_id, canonical.canonical_string)
+        assert not generator.verify_id(doc_id, canonical.canonical_string)
+
+    def test_blake2b_payer_name_hash(self, generator):
+        """Test skrótu nazwy płatnika KP - MD5 tylko w domyślnym schemacie."""
+        blake = DocumentIDGenerator(hash_algo="blake2b")
+
+        assert generator._name_hash(b"JAN KOWALSKI") == "bd34e785"  # md5[:8]
+        assert len(blake._name_hash(b"JAN KOWALSKI")) == 8
+        assert blake._name_hash(b"JAN KOWALSKI") != generator._name_hash(b"JAN KOWALSKI")
+
+    def test_unknown_hash_algo(self):
+        """Test nieobsługiwanej funkcji skrótu."""
+        with pytest.raises(ValueError):
+            DocumentIDGenerator(hash_algo="md5")
+
     def test_parse_id(self, generator):
         """Test parsowania ID."""
         doc_id = "DOC-FV-A7B3C9D2E1F04856"
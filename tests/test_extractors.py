@@ -250,6 +250,26 @@ class TestDocumentExtractor:
         result = extractor.extract(ocr)
         assert result.category == DocumentCategory.UNKNOWN
 
+    def test_extract_batch(self, extractor):
+        invoice = create_mock_ocr_result(
+            full_text="FAKTURA VAT nr FV/2025/001\nNIP: 5213017228\nBrutto: 1000,00 zł",
+            detected_nips=["5213017228"],
+            detected_amounts=["1000.00"],
+            detected_invoice_numbers=["FV/2025/001"],
+        )
+        receipt = create_mock_ocr_result(
+            full_text="PARAGON FISKALNY\nNIP: 5213017228\nSUMA: 50,00 PLN",
+            detected_nips=["5213017228"],
+            detected_amounts=["50.00"],
+        )
+
+        results = extractor.extract_batch([invoice, receipt, invoice])
+
+        assert [r.category for r in results] == [
+            DocumentCategory.INVOICE, DocumentCategory.RECEIPT, DocumentCategory.INVOICE,
+        ]
+        assert results == [extractor.extract(ocr) for ocr in (invoice, receipt, invoice)]
+
     def test_extract_all_candidates(self, extractor):
         """Test zwracania wszystkich pasujących ekstraktorów."""
         ocr = create_mock_ocr_result(
@@ -0,0 +1,129 @@
+"""
+Testy pipeline'u przetwarzania dokumentów (bez uruchamiania OCR).
+"""
+
+from docid import pipeline as pipeline_module
+from docid.ocr_processor import (
+    BaseOCRProcessor,
+    DocumentOCRResult,
+    OCREngine,
+    OCRProcessor,
+    OCRResult,
+)
+from docid.pipeline import DocumentPipeline, get_pipeline
+
+
+class TestGetPipeline:
+    """Testy współdzielonego pipeline'u."""
+
+    def test_same_config_returns_same_instance(self):
+        assert get_pipeline() is get_pipeline(ocr_engine=OCREngine.TESSERACT)
+
+    def test_different_config_returns_different_instance(self):
+        default = get_pipeline()
+        assert get_pipeline(id_prefix="TST") is not default
+        assert get_pipeline(ocr_engine=OCREngine.PADDLE) is not default
+
+    def test_config_is_applied(self):
+        pipeline = get_pipeline(ocr_engine=OCREngine.PADDLE, id_prefix="TST", use_gpu=True)
+        assert pipeline.ocr.preferred_engine == OCREngine.PADDLE
+        assert pipeline.ocr.use_gpu is True
+        assert pipeline.id_generator.prefix == "TST"
+
+
+class _PagedOCR:
+    """Zastępczy OCR zwracający gotowe strony PDF i liczący rozpoznane."""
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.pages_read = 0
+
+    def iter_pdf_pages(self, pdf_path):
+        for i, text in enumerate(self.texts):
+            self.pages_read += 1
+            yield DocumentOCRResult(
+                full_text=text,
+                lines=[OCRResult(text=text, confidence=0.95)],
+                average_confidence=0.95,
+                engine_used=OCREngine.TESSERACT,
+                source_file=f"{pdf_path}#page={i+1}",
+            )
+
+
+class TestProcessUntilMatch:
+    """Testy weryfikacji z wczesnym zakończeniem OCR."""
+
+    INVOICE_PAGE = (
+        "FAKTURA VAT\n"
+        "Nr: FV/2025/00142\n"
+        "Data wystawienia: 2025-01-15\n"
+        "Sprzedawca: NIP 5213017228\n"
+        "Razem brutto: 1 230,00 zł\n"
+    )
+
+    def _pipeline(self, texts):
+        pipeline = DocumentPipeline()
+        pipeline.ocr = _PagedOCR(texts)
+        return pipeline
+
+    def test_stops_after_matching_page(self):
+        full = self._pipeline([self.INVOICE_PAGE, "Strona 2"])
+        expected = full.process_until_match("f.pdf", "DOC-FV-0000000000000000").document_id
+        assert full.ocr.pages_read == 2
+
+        pipeline = self._pipeline([self.INVOICE_PAGE, "Strona 2"])
+        result = pipeline.process_until_match("f.pdf", expected)
+        assert result.document_id == expected
+        assert pipeline.ocr.pages_read == 1
+
+    def test_mismatch_reads_all_pages(self):
+        pipeline = self._pipeline([self.INVOICE_PAGE, "Strona 2", "Strona 3"])
+        assert not pipeline.verify_document("f.pdf", "DOC-FV-0000000000000000")
+        assert pipeline.ocr.pages_read == 3
+
+    def test_processor_without_page_support_falls_back_to_process_pdf(self):
+        """Procesor z samymi metodami abstrakcyjnymi też weryfikuje PDF."""
+        page = self.INVOICE_PAGE
+
+        class WholePdfOCR(BaseOCRProcessor):
+            def process_image(self, image_path):
+                raise AssertionError("not an image")
+
+            def process_pdf(self, pdf_path):
+                return [DocumentOCRResult(
+                    full_text=page,
+                    lines=[OCRResult(text=page, confidence=0.95)],
+                    average_confidence=0.95,
+                    engine_used=OCREngine.TESSERACT,
+                    source_file=f"{pdf_path}#page=1",
+                )]
+
+        pipeline = DocumentPipeline()
+        pipeline.ocr = WholePdfOCR()
+        expected = pipeline.process_until_match("f.pdf", "DOC-FV-0000000000000000").document_id
+        assert pipeline.verify_document("f.pdf", expected)
+
+
+class TestBatchWarmup:
+    """Rozgrzewanie OCR trafia tam, gdzie faktycznie działa model."""
+
+    def _count_warmups(self, monkeypatch):
+        warmed = []
+        monkeypatch.setattr(OCRProcessor, "warmup", lambda self, *a, **kw: warmed.append(self))
+        return warmed
+
+    def test_sequential_batch_warms_up_own_engine(self, monkeypatch):
+        warmed = self._count_warmups(monkeypatch)
+        pipeline = DocumentPipeline()
+        assert list(pipeline.process_batch_stream([], warmup=True)) == []
+        assert warmed == [pipeline.ocr]
+
+    def test_no_warmup_by_default(self, monkeypatch):
+        warmed = self._count_warmups(monkeypatch)
+        list(DocumentPipeline().process_batch_stream([]))
+        assert warmed == []
+
+    def test_batch_worker_warms_up_own_engine(self, monkeypatch):
+        warmed = self._count_warmups(monkeypatch)
+        pipeline_module._init_batch_worker(DocumentPipeline()._config, False, True)
+        assert warmed == [pipeline_module._worker_state.pipeline.ocr]
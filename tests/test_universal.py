@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import pickle
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from docid import cli_universal
+from docid.cli_universal import main
+from docid.document_id_universal import UniversalDocumentIDGenerator
+from docid.ocr_processor import OCRProcessor
+from docid.pipeline import DocumentPipeline
+
+
+def test_generator_pickle_round_trip(tmp_path: Path) -> None:
+    doc = tmp_path / "doc.txt"
+    doc.write_text("Faktura VAT nr FV/2025/001", encoding="utf-8")
+    generator = UniversalDocumentIDGenerator(prefix="TEST")
+    expected = generator.generate_universal_id(doc)
+
+    restored = pickle.loads(pickle.dumps(generator))
+
+    assert restored.prefix == "TEST"
+    assert restored.hash_algo == "sha256"
+    assert restored.generate_universal_id(doc) == expected
+
+
+def test_modifying_returned_features_does_not_change_id(tmp_path: Path) -> None:
+    doc = tmp_path / "doc.txt"
+    doc.write_text("Faktura VAT nr FV/2025/001", encoding="utf-8")
+    generator = UniversalDocumentIDGenerator()
+    expected = generator.generate_universal_id(doc)
+
+    features = generator.get_document_features(doc)
+    features.content_hash = "0" * 16
+
+    assert generator.generate_universal_id(doc) == expected
+    assert generator.verify_universal_id(doc, expected)
+    assert generator.get_document_features(doc).content_hash != "0" * 16
+
+
+def test_cli_universal_reports_each_file(tmp_path: Path, capsys) -> None:
+    good1 = tmp_path / "a.txt"
+    good1.write_text("pierwszy", encoding="utf-8")
+    good2 = tmp_path / "b.txt"
+    good2.write_text("drugi", encoding="utf-8")
+    missing = tmp_path / "brak.txt"
+    generator = UniversalDocumentIDGenerator()
+
+    exit_code = main(["universal", str(good1), str(missing), str(good2)])
+
+    out, err = capsys.readouterr()
+    assert exit_code == 1
+    assert out.splitlines() == [
+        f"{generator.generate_universal_id(good1)}  {good1}",
+        f"{generator.generate_universal_id(good2)}  {good2}",
+    ]
+    assert str(missing) in err
+
+    assert main(["universal", str(good1), str(good2)]) == 0
+
+
+def test_cli_compare_same_file_runs_ocr_once(tmp_path: Path, monkeypatch, capsys) -> None:
+    doc = tmp_path / "faktura.txt"
+    doc.write_text("Faktura VAT nr FV/2025/001", encoding="utf-8")
+    calls = []
+    lock = threading.Lock()
+
+    def fake_process(self, file_path):
+        with lock:
+            calls.append(file_path)
+        time.sleep(0.1)  # long enough for a second, parallel call to miss the cache
+        return SimpleNamespace(document_id="DOC-FV-0000000000000000", canonical_string="a|b", document_type=None)
+
+    monkeypatch.setattr(DocumentPipeline, "process", fake_process)
+    monkeypatch.setattr(OCRProcessor, "is_thread_safe", property(lambda self: True))
+    cli_universal._cached_process.cache_clear()
+
+    assert main(["compare", str(doc), str(doc), "--format", "json"]) == 0
+
+    capsys.readouterr()
+    assert len(calls) == 1
+    cli_universal._cached_process.cache_clear()